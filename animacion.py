@@ -0,0 +1,243 @@
+import time
+import tkinter as tk
+from collections import deque
+
+
+def suavizar(progreso):
+    # Aceleración y frenado suaves (smoothstep)
+    return progreso * progreso * (3 - 2 * progreso)
+
+
+def lineal(progreso):
+    return progreso
+
+
+class Interpolacion:
+    """Llama a ``funcion(progreso)`` en cada cuadro durante ``duracion`` segundos.
+    
+    El progreso va de 0 a 1 pasado por ``curva``; el último cuadro siempre
+    recibe exactamente 1.
+    """
+    
+    def __init__(self, duracion, funcion, curva=suavizar):
+        self.duracion = duracion
+        self.funcion = funcion
+        self.curva = curva
+        self.transcurrido = 0.0
+    
+    def avanzar(self, segundos):
+        # Devuelve el tiempo que sobró, o None si la interpolación no terminó
+        self.transcurrido += segundos
+        if self.duracion <= 0 or self.transcurrido >= self.duracion:
+            self.funcion(1.0)
+            return self.transcurrido - max(self.duracion, 0)
+        self.funcion(self.curva(self.transcurrido / self.duracion))
+        return None
+
+
+class Espera(Interpolacion):
+    def __init__(self, duracion):
+        super().__init__(duracion, lambda progreso: None)
+
+
+class Accion(Interpolacion):
+    # Se ejecuta una vez, sin consumir tiempo
+    def __init__(self, funcion):
+        super().__init__(0, lambda progreso: funcion())
+
+
+class Hito(Interpolacion):
+    """Marca el fin de un paso: ``paso()`` avanza hasta el próximo hito."""
+    
+    def __init__(self):
+        super().__init__(0, lambda progreso: None)
+
+
+class Planificador:
+    """Cola de animaciones movida por cuadros con ``after``, sin bloquear Tk.
+    
+    Uso::
+        
+        planificador = Planificador(root)
+        planificador.agregar(Interpolacion(0.4, mover), Accion(dibujar), Espera(1.0), Hito())
+        planificador.pausar(); planificador.paso(); planificador.reanudar()
+        planificador.velocidad = 2.0
+        planificador.cancelar()
+    
+    Las tareas se ejecutan en orden. En cada cuadro se mide el tiempo real
+    transcurrido (multiplicado por ``velocidad``) y se reparte entre las
+    tareas, así que la animación dura lo mismo aunque algún cuadro llegue
+    tarde, y a cualquier velocidad el bucle de eventos sigue libre entre
+    cuadros. Pausado o sin tareas no se programa ningún cuadro.
+    
+    Solo usa ``after`` y ``after_cancel`` del widget.
+    """
+    
+    def __init__(self, widget, cuadros_por_segundo=60):
+        self.widget = widget
+        self.intervalo_ms = max(1, int(1000 / cuadros_por_segundo))
+        self.velocidad = 1.0
+        self.pausado = False
+        self._cola = deque()
+        self._id_after = None
+        self._ultimo = None
+        # Con paso() se corre hasta el próximo hito y se vuelve a pausar
+        self._hasta_hito = False
+        # Mientras corre un cuadro el siguiente lo programa el propio cuadro
+        self._en_cuadro = False
+    
+    def __len__(self):
+        return len(self._cola)
+    
+    @property
+    def activo(self):
+        return bool(self._cola)
+    
+    def agregar(self, *tareas):
+        self._cola.extend(tareas)
+        self._programar()
+    
+    def pausar(self):
+        self.pausado = True
+        self._hasta_hito = False
+        self._detener()
+    
+    def reanudar(self):
+        self.pausado = False
+        self._hasta_hito = False
+        self._programar()
+    
+    def paso(self):
+        # Avanza un paso (hasta el próximo hito) y queda en pausa
+        self.pausado = False
+        self._hasta_hito = True
+        self._programar()
+    
+    def cancelar(self):
+        """Descarta todas las tareas pendientes sin ejecutarlas."""
+        self._detener()
+        self._cola.clear()
+        self._hasta_hito = False
+    
+    def _programar(self):
+        # Nunca hay más de un after pendiente: si no, cada agregar hecho
+        # desde una tarea sumaría una cadena de cuadros más.
+        if self._en_cuadro:
+            return
+        if self._id_after is None and self._cola and not self.pausado:
+            self._ultimo = time.perf_counter()
+            self._id_after = self.widget.after(self.intervalo_ms, self._cuadro)
+    
+    def _detener(self):
+        if self._id_after is not None:
+            self.widget.after_cancel(self._id_after)
+            self._id_after = None
+    
+    def _cuadro(self):
+        self._id_after = None
+        ahora = time.perf_counter()
+        disponible = (ahora - self._ultimo) * self.velocidad
+        self._ultimo = ahora
+        
+        self._en_cuadro = True
+        try:
+            while self._cola and not self.pausado:
+                tarea = self._cola[0]
+                sobrante = tarea.avanzar(disponible)
+                if sobrante is None:
+                    break
+                # Una acción pudo haber cancelado o reemplazado la cola
+                if self._cola and self._cola[0] is tarea:
+                    self._cola.popleft()
+                disponible = sobrante
+                if isinstance(tarea, Hito) and self._hasta_hito:
+                    self.pausar()
+        finally:
+            self._en_cuadro = False
+        
+        if self._id_after is None and self._cola and not self.pausado:
+            self._id_after = self.widget.after(self.intervalo_ms, self._cuadro)
+
+
+class Superposicion:
+    """Mensaje a pantalla completa sobre la ventana, con fundido de entrada y salida.
+    
+    La ventana se crea una sola vez y se oculta entre mensajes. Todo corre
+    en el hilo de Tk con un Planificador. Los mensajes que llegan mientras
+    se muestra otro esperan su turno; solo se guardan los ``maximo_en_espera``
+    más recientes y no se repite un mensaje igual al que está en pantalla o
+    al último en espera, así que varios reinicios seguidos no se acumulan.
+    """
+    
+    def __init__(self, root, fondo="black", color="#ff9500", fuente=("Helvetica", 36, "bold"),
+                 opacidad=0.7, fundido=0.25, maximo_en_espera=2):
+        self.root = root
+        self.fondo = fondo
+        self.color = color
+        self.fuente = fuente
+        self.opacidad = opacidad
+        self.fundido = fundido
+        self.planificador = Planificador(root)
+        self._pendientes = deque(maxlen=maximo_en_espera)
+        self._ventana = None
+        self._etiqueta = None
+        # Texto en pantalla, o None si no se está mostrando nada
+        self._actual = None
+    
+    def mostrar(self, texto, duracion=1.0):
+        """Pone ``texto`` en la cola; ``duracion`` es el tiempo a opacidad plena."""
+        if texto == self._actual and not self._pendientes:
+            return
+        if self._pendientes and self._pendientes[-1][0] == texto:
+            return
+        self._pendientes.append((texto, duracion))
+        if self._actual is None:
+            self._siguiente()
+    
+    def cancelar(self):
+        """Oculta el mensaje actual y descarta los que esperaban."""
+        self.planificador.cancelar()
+        self._pendientes.clear()
+        self._ocultar()
+    
+    def _crear(self):
+        self._ventana = tk.Toplevel(self.root)
+        self._ventana.withdraw()
+        self._ventana.overrideredirect(True)
+        self._ventana.configure(bg=self.fondo)
+        self._etiqueta = tk.Label(self._ventana, font=self.fuente, fg=self.color, bg=self.fondo)
+        self._etiqueta.place(relx=0.5, rely=0.5, anchor="center")
+    
+    def _siguiente(self):
+        if not self._pendientes:
+            return
+        texto, duracion = self._pendientes.popleft()
+        self._actual = texto
+        self.planificador.agregar(Accion(lambda: self._abrir(texto)),
+                                  Interpolacion(self.fundido, self._alfa),
+                                  Espera(duracion),
+                                  Interpolacion(self.fundido, lambda progreso: self._alfa(1 - progreso)),
+                                  Accion(self._terminar))
+    
+    def _abrir(self, texto):
+        if self._ventana is None or not self._ventana.winfo_exists():
+            self._crear()
+        # Cubrir la ventana principal donde esté ahora
+        self._ventana.geometry(f"{self.root.winfo_width()}x{self.root.winfo_height()}"
+                               f"+{self.root.winfo_x()}+{self.root.winfo_y()}")
+        self._etiqueta.config(text=texto)
+        self._alfa(0)
+        self._ventana.deiconify()
+        self._ventana.lift()
+    
+    def _alfa(self, progreso):
+        self._ventana.attributes('-alpha', self.opacidad * progreso)
+    
+    def _terminar(self):
+        self._ocultar()
+        self._siguiente()
+    
+    def _ocultar(self):
+        self._actual = None
+        if self._ventana is not None and self._ventana.winfo_exists():
+            self._ventana.withdraw()
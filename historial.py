@@ -0,0 +1,166 @@
+import tkinter as tk
+from array import array
+from tkinter import font as tkfont, ttk
+
+from motor_juego import ALTO, BAJO, CORRECTO
+
+# Intentos que se guardan como máximo; los más viejos se descartan
+CAPACIDAD = 100_000
+
+# El resultado de cada intento se guarda en un byte
+_RESULTADOS = (BAJO, ALTO, CORRECTO)
+_CODIGOS = {resultado: codigo for codigo, resultado in enumerate(_RESULTADOS)}
+_DESPERDICIADO = 4
+
+
+class HistorialCircular:
+    """Los últimos ``capacidad`` intentos de una partida, en arrays compactos.
+    
+    Cada intento ocupa 9 bytes (el número en un array('q') y el resultado
+    en un bytearray). Con el historial lleno, cada intento nuevo pisa al
+    más viejo; ``total`` cuenta todos, así que las filas conservan su
+    número de intento.
+    """
+    
+    __slots__ = ('capacidad', 'total', '_intentos', '_codigos', '_inicio')
+    
+    def __init__(self, capacidad=CAPACIDAD):
+        self.capacidad = capacidad
+        self.total = 0
+        self._intentos = array('q')
+        self._codigos = bytearray()
+        # Posición de la fila más vieja una vez que el historial se llenó
+        self._inicio = 0
+    
+    def __len__(self):
+        return len(self._codigos)
+    
+    def limpiar(self):
+        self._intentos = array('q')
+        self._codigos = bytearray()
+        self._inicio = 0
+        self.total = 0
+    
+    def agregar(self, intento, resultado, desperdiciado=False):
+        codigo = _CODIGOS[resultado] | (_DESPERDICIADO if desperdiciado else 0)
+        if len(self._codigos) < self.capacidad:
+            self._guardar(len(self._codigos), intento)
+            self._codigos.append(codigo)
+        else:
+            self._guardar(self._inicio, intento)
+            self._codigos[self._inicio] = codigo
+            self._inicio = (self._inicio + 1) % self.capacidad
+        self.total += 1
+    
+    def _guardar(self, posicion, intento):
+        try:
+            if posicion == len(self._intentos):
+                self._intentos.append(intento)
+            else:
+                self._intentos[posicion] = intento
+        except OverflowError:
+            # Límites fuera de 64 bits: se sigue con una lista
+            self._intentos = list(self._intentos)
+            self._guardar(posicion, intento)
+    
+    def fila(self, indice):
+        """(número de intento, intento, resultado, desperdiciado); 0 es la fila más vieja guardada."""
+        if not 0 <= indice < len(self):
+            raise IndexError(f"No existe la fila {indice}")
+        posicion = (self._inicio + indice) % len(self)
+        codigo = self._codigos[posicion]
+        return (self.total - len(self) + indice + 1, self._intentos[posicion],
+                _RESULTADOS[codigo & 3], bool(codigo & _DESPERDICIADO))
+
+
+class VistaHistorial(tk.Frame):
+    """Lista de intentos que solo dibuja las filas que se ven.
+    
+    Los intentos nuevos se juntan y la lista se redibuja una sola vez por
+    vuelta del bucle de eventos (con after_idle), así que muchos intentos
+    seguidos cuestan un único redibujo de unas pocas filas, sin importar
+    cuántos haya. Mientras se está viendo el final, la vista lo sigue.
+    """
+    
+    def __init__(self, master, capacidad=CAPACIDAD, font=("Helvetica", 10), **opciones):
+        super().__init__(master, **opciones)
+        self.historial = HistorialCircular(capacidad)
+        # Primera fila visible y cuántas entran en el widget
+        self.primera = 0
+        self.filas_visibles = 8
+        self._id_dibujo = None
+        self._alto_fila = max(1, tkfont.Font(font=font).metrics('linespace'))
+        
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.barra.pack(side="right", fill="y")
+        self.texto = tk.Text(self, height=self.filas_visibles, width=40, state="disabled", font=font, wrap="none")
+        self.texto.pack(side="left", fill="both", expand=True)
+        
+        self.texto.bind("<Configure>", self._redimensionar)
+        for evento in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.texto.bind(evento, self._rueda)
+    
+    def agregar(self, intento, resultado, desperdiciado=False):
+        total = len(self.historial)
+        siguiendo = self.primera + self.filas_visibles >= total
+        self.historial.agregar(intento, resultado, desperdiciado)
+        if siguiendo:
+            self.primera = len(self.historial) - self.filas_visibles
+        elif len(self.historial) == total:
+            # Se descartó la fila más vieja: se mantienen las mismas filas a la vista
+            self.primera = max(0, self.primera - 1)
+        self._programar()
+    
+    def limpiar(self):
+        self.historial.limpiar()
+        self.primera = 0
+        self._programar()
+    
+    def _programar(self):
+        if self._id_dibujo is None:
+            self._id_dibujo = self.after_idle(self._dibujar)
+    
+    def _dibujar(self):
+        self._id_dibujo = None
+        total = len(self.historial)
+        self.primera = max(0, min(self.primera, total - self.filas_visibles))
+        ultima = min(total, self.primera + self.filas_visibles)
+        lineas = [self._formatear(*self.historial.fila(i)) for i in range(self.primera, ultima)]
+        
+        self.texto.config(state="normal")
+        self.texto.delete("1.0", tk.END)
+        self.texto.insert("1.0", "\n".join(lineas))
+        self.texto.config(state="disabled")
+        if total:
+            self.barra.set(self.primera / total, ultima / total)
+        else:
+            self.barra.set(0, 1)
+    
+    @staticmethod
+    def _formatear(numero, intento, resultado, desperdiciado):
+        if resultado == CORRECTO:
+            return f"#{numero}: {intento} → ¡CORRECTO!"
+        nota = " (ya estaba descartado)" if desperdiciado else ""
+        texto = "Muy bajo" if resultado == BAJO else "Muy alto"
+        return f"#{numero}: {intento} → {texto}{nota}"
+    
+    def _desplazar(self, accion, cantidad, unidad=None):
+        # Recibe los comandos de la barra: moveto fracción / scroll n units|pages
+        if accion == "moveto":
+            self.primera = int(float(cantidad) * len(self.historial))
+        elif unidad == "pages":
+            self.primera += int(cantidad) * self.filas_visibles
+        else:
+            self.primera += int(cantidad)
+        self._programar()
+    
+    def _rueda(self, evento):
+        arriba = evento.num == 4 or (evento.num != 5 and evento.delta > 0)
+        self._desplazar("scroll", -3 if arriba else 3, "units")
+        return "break"
+    
+    def _redimensionar(self, evento):
+        filas = max(1, evento.height // self._alto_fila)
+        if filas != self.filas_visibles:
+            self.filas_visibles = filas
+            self._programar()
@@ -2,7 +2,10 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import random
 import time
-import threading
+
+from animacion import Accion, Espera, Hito, Interpolacion, Planificador, Superposicion
+from historial import VistaHistorial
+from motor_juego import ALTO, BAJO, CORRECTO, FUERA_DE_RANGO, SesionJuego
 
 class JuegoAdivinanza:
     def __init__(self, root):
@@ -12,15 +15,8 @@ class JuegoAdivinanza:
         self.root.resizable(False, False)
         self.root.configure(bg="#f0f0f0")
         
-        # Variables del juego
-        self.numero_secreto = None
-        self.intentos = []
-        self.intentos_maximos = 0
-        self.intentos_restantes = 0
-        self.limite_inferior = 0
-        self.limite_superior = 0
-        self.jugando = False
-        self.puntuacion = 0
+        # Partida en curso; las reglas y el puntaje viven en motor_juego.py
+        self.sesion = None
         
         # Inicializar la variable sonidos_activados ANTES de usarla
         self.sonidos_activados = tk.BooleanVar(value=True)
@@ -45,6 +41,9 @@ class JuegoAdivinanza:
         self.crear_pantalla_juego()
         self.crear_pantalla_demo()
         
+        # Mensajes a pantalla completa ("¡VICTORIA!", ...), siempre con la misma ventana
+        self.superposicion = Superposicion(self.root, color=self.color_acento)
+        
         # Mostrar pantalla inicial
         self.mostrar_frame(self.frame_menu)
         
@@ -80,6 +79,10 @@ class JuegoAdivinanza:
                         foreground=self.color_secundario,
                         background=self.color_fondo)
     
+    @property
+    def jugando(self):
+        return self.sesion is not None and self.sesion.jugando
+    
     def mostrar_frame(self, frame):
         # Ocultar todos los frames
         for f in [self.frame_menu, self.frame_configuracion, self.frame_juego, self.frame_demo]:
@@ -216,8 +219,9 @@ class JuegoAdivinanza:
         
         ttk.Label(frame_historial, text="Historial de intentos:", background="white").pack(anchor="w", padx=10, pady=5)
         
-        self.historial_text = tk.Text(frame_historial, height=8, width=40, state="disabled", font=("Helvetica", 10))
-        self.historial_text.pack(padx=10, pady=5, fill="both", expand=True)
+        # Solo dibuja las filas visibles, aunque la partida tenga miles de intentos
+        self.vista_historial = VistaHistorial(frame_historial, bg="white")
+        self.vista_historial.pack(padx=10, pady=5, fill="both", expand=True)
         
         # Panel inferior - Botones
         panel_botones = tk.Frame(self.frame_juego, bg=self.color_fondo)
@@ -261,55 +265,62 @@ class JuegoAdivinanza:
         frame_controles.pack(pady=20)
         
         btn_volver = ttk.Button(frame_controles, text="Volver al Menú", 
-                              command=lambda: self.mostrar_frame(self.frame_menu))
+                              command=self.salir_demo)
         btn_volver.pack(side="left", padx=10)
         
         self.btn_iniciar_demo = ttk.Button(frame_controles, text="Iniciar Demostración", 
                                         command=self.ejecutar_demo)
         self.btn_iniciar_demo.pack(side="left", padx=10)
         
+        self.btn_pausa_demo = ttk.Button(frame_controles, text="Pausar", command=self.alternar_pausa_demo)
+        self.btn_pausa_demo.pack(side="left", padx=10)
+        
+        btn_paso = ttk.Button(frame_controles, text="Paso", command=self.paso_demo)
+        btn_paso.pack(side="left", padx=10)
+        
+        # Velocidad de reproducción
+        ttk.Label(frame_controles, text="Velocidad:").pack(side="left", padx=(10, 5))
+        self.velocidad_demo_var = tk.StringVar(value="1x")
+        velocidad_combo = ttk.Combobox(frame_controles, textvariable=self.velocidad_demo_var,
+                                      values=["0.5x", "1x", "2x", "4x", "8x"], state="readonly", width=5)
+        velocidad_combo.pack(side="left")
+        velocidad_combo.bind("<<ComboboxSelected>>", lambda e: self.cambiar_velocidad_demo())
+        
+        # Las animaciones de la demo avanzan por cuadros con after, sin bloquear la ventana
+        self.planificador_demo = Planificador(self.root)
+    
     def iniciar_juego(self):
         try:
             # Obtener configuración
-            self.limite_inferior = int(self.min_var.get())
-            self.limite_superior = int(self.max_var.get())
-            self.intentos_maximos = int(self.intentos_var.get())
-            
-            # Validaciones
-            if self.limite_inferior >= self.limite_superior:
-                messagebox.showerror("Error", "El límite inferior debe ser menor que el límite superior.")
-                return
-                
-            if self.intentos_maximos <= 0:
-                messagebox.showerror("Error", "El número de intentos debe ser mayor que cero.")
-                return
-                
-            # Inicializar juego
-            self.numero_secreto = random.randint(self.limite_inferior, self.limite_superior)
-            self.intentos = []
-            self.intentos_restantes = self.intentos_maximos
-            self.jugando = True
-            
-            # Actualizar interfaz
-            self.lbl_rango.config(text=f"Rango: {self.limite_inferior}-{self.limite_superior}")
-            self.lbl_intentos.config(text=f"Intentos: {self.intentos_restantes}/{self.intentos_maximos}")
-            self.lbl_mensaje.config(text="¡Adivina el número secreto!")
-            self.lbl_pista.config(text="Ingresa un número y presiona 'Adivinar'")
-            
-            # Limpiar historial
-            self.historial_text.config(state="normal")
-            self.historial_text.delete("1.0", tk.END)
-            self.historial_text.config(state="disabled")
-            
-            # Cambiar a pantalla de juego
-            self.mostrar_frame(self.frame_juego)
-            self.entrada_numero.focus()
-            
-            # Efecto de inicio
-            self.mostrar_animacion("¡COMIENZA EL JUEGO!")
-            
+            limite_inferior = int(self.min_var.get())
+            limite_superior = int(self.max_var.get())
+            intentos_maximos = int(self.intentos_var.get())
         except ValueError:
             messagebox.showerror("Error", "Por favor, ingresa valores numéricos válidos.")
+            return
+            
+        try:
+            # Inicializar juego (el motor valida la configuración)
+            self.sesion = SesionJuego(limite_inferior, limite_superior, intentos_maximos)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        
+        # Actualizar interfaz
+        self.lbl_rango.config(text=f"Rango: {limite_inferior}-{limite_superior}")
+        self.lbl_intentos.config(text=f"Intentos: {intentos_maximos}/{intentos_maximos}")
+        self.lbl_mensaje.config(text="¡Adivina el número secreto!")
+        self.lbl_pista.config(text="Ingresa un número y presiona 'Adivinar'")
+        
+        # Limpiar historial
+        self.vista_historial.limpiar()
+        
+        # Cambiar a pantalla de juego
+        self.mostrar_frame(self.frame_juego)
+        self.entrada_numero.focus()
+        
+        # Efecto de inicio
+        self.mostrar_animacion("¡COMIENZA EL JUEGO!")
     
     def verificar_intento(self):
         if not self.jugando:
@@ -317,109 +328,72 @@ class JuegoAdivinanza:
             
         try:
             intento = int(self.entrada_numero.get())
-            self.entrada_numero.delete(0, tk.END)
+        except ValueError:
+            messagebox.showerror("Error", "Por favor, ingresa un número válido.")
+            return
+        self.entrada_numero.delete(0, tk.END)
+        
+        sesion = self.sesion
+        resultado = sesion.intentar(intento)
+        
+        # Verificar si el número está en el rango
+        if resultado.resultado == FUERA_DE_RANGO:
+            messagebox.showwarning("Fuera de rango", 
+                                  f"Por favor, ingresa un número entre {sesion.limite_inferior} y {sesion.limite_superior}.")
+            return
+        
+        # Actualizar interfaz
+        self.lbl_intentos.config(text=f"Intentos: {resultado.intentos_restantes}/{sesion.intentos_maximos}")
+        
+        quedan = f" (quedan {resultado.posibles} números posibles)"
+        
+        # Añadir al historial (se dibuja en la próxima vuelta del bucle de eventos)
+        self.vista_historial.agregar(intento, resultado.resultado, resultado.desperdiciado)
+        if resultado.resultado == BAJO:
+            self.lbl_pista.config(text="El número secreto es MAYOR que tu intento" + quedan)
+        elif resultado.resultado == ALTO:
+            self.lbl_pista.config(text="El número secreto es MENOR que tu intento" + quedan)
+        
+        # Verificar resultado
+        if resultado.resultado == CORRECTO:
+            mensaje = f"¡FELICIDADES! Has adivinado el número en {sesion.intentos_usados} intentos.\n"
+            mensaje += f"Tu puntuación es: {resultado.puntuacion} puntos."
             
-            # Verificar si el número está en el rango
-            if intento < self.limite_inferior or intento > self.limite_superior:
-                messagebox.showwarning("Fuera de rango", 
-                                      f"Por favor, ingresa un número entre {self.limite_inferior} y {self.limite_superior}.")
-                return
-                
-            # Registrar intento
-            self.intentos.append(intento)
-            self.intentos_restantes -= 1
+            self.lbl_mensaje.config(text="¡HAS GANADO!")
             
-            # Actualizar interfaz
-            self.lbl_intentos.config(text=f"Intentos: {self.intentos_restantes}/{self.intentos_maximos}")
+            # Animación de victoria
+            self.mostrar_animacion("¡VICTORIA!")
             
-            # Añadir al historial
-            self.historial_text.config(state="normal")
-            if intento < self.numero_secreto:
-                self.historial_text.insert(tk.END, f"#{len(self.intentos)}: {intento} → Muy bajo\n")
-                self.lbl_pista.config(text="El número secreto es MAYOR que tu intento")
-            elif intento > self.numero_secreto:
-                self.historial_text.insert(tk.END, f"#{len(self.intentos)}: {intento} → Muy alto\n")
-                self.lbl_pista.config(text="El número secreto es MENOR que tu intento")
-            else:
-                self.historial_text.insert(tk.END, f"#{len(self.intentos)}: {intento} → ¡CORRECTO!\n")
-            self.historial_text.see(tk.END)
-            self.historial_text.config(state="disabled")
+            # Mostrar diálogo después de la animación
+            self.root.after(2000, lambda: messagebox.showinfo("¡Felicidades!", mensaje))
             
-            # Verificar resultado
-            if intento == self.numero_secreto:
-                self.jugando = False
-                intentos_usados = self.intentos_maximos - self.intentos_restantes
-                factor_dificultad = (self.limite_superior - self.limite_inferior) / 100
-                self.puntuacion = int((1000 / self.intentos_maximos) * (self.intentos_maximos - intentos_usados + 1) * factor_dificultad)
-                
-                mensaje = f"¡FELICIDADES! Has adivinado el número en {intentos_usados} intentos.\n"
-                mensaje += f"Tu puntuación es: {self.puntuacion} puntos."
-                
-                self.lbl_mensaje.config(text="¡HAS GANADO!")
-                
-                # Animación de victoria
-                self.mostrar_animacion("¡VICTORIA!")
-                
-                # Mostrar diálogo después de la animación
-                self.root.after(2000, lambda: messagebox.showinfo("¡Felicidades!", mensaje))
-                
-            elif self.intentos_restantes == 0:
-                self.jugando = False
-                self.lbl_mensaje.config(text="¡JUEGO TERMINADO!")
-                self.lbl_pista.config(text=f"El número secreto era: {self.numero_secreto}")
-                
-                messagebox.showinfo("Fin del juego", 
-                                  f"Se han agotado tus intentos.\nEl número secreto era: {self.numero_secreto}")
-        
-        except ValueError:
-            messagebox.showerror("Error", "Por favor, ingresa un número válido.")
+        elif resultado.terminado:
+            self.lbl_mensaje.config(text="¡JUEGO TERMINADO!")
+            self.lbl_pista.config(text=f"El número secreto era: {sesion.numero_secreto}")
+            
+            messagebox.showinfo("Fin del juego", 
+                              f"Se han agotado tus intentos.\nEl número secreto era: {sesion.numero_secreto}")
     
     def dar_pista(self):
-        if not self.jugando or len(self.intentos) == 0:
+        # Pista basada en búsqueda binaria; el motor devuelve None si no corresponde
+        pista = self.sesion.pista() if self.sesion is not None else None
+        if pista is None:
             return
-            
-        # Calcular pista basada en búsqueda binaria
-        intentos_validos = [i for i in self.intentos]
-        min_actual = self.limite_inferior
-        max_actual = self.limite_superior
-        
-        for intento in intentos_validos:
-            if intento < self.numero_secreto:
-                min_actual = max(min_actual, intento + 1)
-            elif intento > self.numero_secreto:
-                max_actual = min(max_actual, intento - 1)
-        
-        sugerencia = (min_actual + max_actual) // 2
         
+        sugerencia, min_actual, max_actual = pista
         messagebox.showinfo("Pista de búsqueda binaria", 
                           f"Considerando tus intentos anteriores, te sugiero probar con el número {sugerencia}.\n\n"
                           f"Este número está en medio del rango posible actual ({min_actual}-{max_actual}).")
     
     def mostrar_animacion(self, texto):
-        def animar():
-            # Crear overlay
-            overlay = tk.Toplevel(self.root)
-            overlay.geometry(f"{self.root.winfo_width()}x{self.root.winfo_height()}+{self.root.winfo_x()}+{self.root.winfo_y()}")
-            overlay.overrideredirect(True)
-            overlay.attributes('-alpha', 0.7)
-            overlay.configure(bg="black")
-            
-            # Etiqueta de texto
-            lbl = tk.Label(overlay, text=texto, font=("Helvetica", 36, "bold"), fg=self.color_acento, bg="black")
-            lbl.place(relx=0.5, rely=0.5, anchor="center")
-            
-            # Cerrar después de un tiempo
-            self.root.after(1500, overlay.destroy)
-        
-        # Ejecutar en un hilo separado para no bloquear la interfaz
-        animation_thread = threading.Thread(target=animar)
-        animation_thread.daemon = True
-        animation_thread.start()
+        # Se encola en la superposición; el fundido corre con after, sin hilos
+        self.superposicion.mostrar(texto)
     
     def iniciar_demo(self):
         self.mostrar_frame(self.frame_demo)
         
-        # Resetear canvas
+        # Resetear canvas y cualquier demostración anterior
+        self.detener_demo()
         self.canvas.delete("all")
         
         # Configurar valores para la demostración
@@ -437,60 +411,106 @@ class JuegoAdivinanza:
         self.lbl_demo_status.config(text=f"Se ha generado un número secreto entre {self.demo_min} y {self.demo_max}")
     
     def ejecutar_demo(self):
+        # Limpiar una demostración anterior
+        self.detener_demo()
+        self.canvas.delete("marcador", "punto", "encontrado")
+        
         # Deshabilitar botón durante la demo
         self.btn_iniciar_demo.config(state="disabled")
         
+        # Marcador del intento; se desliza de un intento al siguiente
+        self.demo_x = 50
+        self.demo_punto = self.canvas.create_oval(40, 90, 60, 110, fill=self.color_acento, tags="punto")
+        self.demo_texto = self.canvas.create_text(50, 70, text="", tags="punto")
+        
         # Iniciar demo
         self.ejecutar_paso_demo(self.demo_min, self.demo_max, 1)
         
     def ejecutar_paso_demo(self, min_actual, max_actual, paso):
+        # Programa las animaciones de un paso; nada aquí espera ni bloquea
         # Calcular intento actual (búsqueda binaria)
         intento = (min_actual + max_actual) // 2
         
-        # Actualizar info
-        self.lbl_demo_status.config(text=f"Paso #{paso}: Probando con {intento}")
-        
-        # Dibujar marcador del intento actual
+        # Posición del marcador del intento actual
+        x_inicio = self.demo_x
         x_pos = 50 + (intento - self.demo_min) * (700 / (self.demo_max - self.demo_min))
+        self.demo_x = x_pos
+        
+        def preparar():
+            # Actualizar info y limpiar marcadores anteriores
+            self.lbl_demo_status.config(text=f"Paso #{paso}: Probando con {intento}")
+            self.canvas.delete("marcador")
+            self.canvas.itemconfigure(self.demo_texto, text=str(intento))
+        
+        def mover(progreso):
+            x = x_inicio + (x_pos - x_inicio) * progreso
+            self.canvas.coords(self.demo_punto, x-10, 90, x+10, 110)
+            self.canvas.coords(self.demo_texto, x, 70)
+        
+        def verificar():
+            if intento == self.demo_secreto:
+                self.lbl_demo_status.config(text=f"¡Encontrado! El número secreto es {intento} (en {paso} pasos)")
+                self.canvas.create_text(400, 30, text="¡NÚMERO ENCONTRADO!", font=("Helvetica", 16, "bold"),
+                                        fill="green", tags="encontrado")
+                self.btn_iniciar_demo.config(state="normal")
+            elif intento < self.demo_secreto:
+                # Dibujar flecha hacia la derecha
+                self.canvas.create_line(x_pos, 130, x_pos+50, 130, arrow=tk.LAST, tags="marcador")
+                self.lbl_demo_info.config(text="El número es MAYOR. Descartamos todos los números menores o iguales al intento actual.")
+                
+                # Colorear área descartada
+                self.canvas.create_rectangle(50, 150, x_pos, 180, fill="lightgray", tags="marcador")
+                self.canvas.create_text((50+x_pos)/2, 165, text="Descartado", tags="marcador")
+                
+                # Siguiente paso
+                self.ejecutar_paso_demo(intento + 1, max_actual, paso + 1)
+            else:  # intento > self.demo_secreto
+                # Dibujar flecha hacia la izquierda
+                self.canvas.create_line(x_pos, 130, x_pos-50, 130, arrow=tk.LAST, tags="marcador")
+                self.lbl_demo_info.config(text="El número es MENOR. Descartamos todos los números mayores o iguales al intento actual.")
+                
+                # Colorear área descartada
+                self.canvas.create_rectangle(x_pos, 150, 750, 180, fill="lightgray", tags="marcador")
+                self.canvas.create_text((x_pos+750)/2, 165, text="Descartado", tags="marcador")
+                
+                # Siguiente paso
+                self.ejecutar_paso_demo(min_actual, intento - 1, paso + 1)
         
-        # Limpiar marcadores anteriores
-        self.canvas.delete("marcador")
-        
-        # Dibujar nuevo marcador
-        self.canvas.create_oval(x_pos-10, 90, x_pos+10, 110, fill=self.color_acento, tags="marcador")
-        self.canvas.create_text(x_pos, 70, text=str(intento), tags="marcador")
-        
-        # Pausar para efecto visual
-        self.root.update()
-        self.root.after(1000)
-        
-        # Verificar resultado
-        if intento == self.demo_secreto:
-            self.lbl_demo_status.config(text=f"¡Encontrado! El número secreto es {intento} (en {paso} pasos)")
-            self.canvas.create_text(400, 30, text="¡NÚMERO ENCONTRADO!", font=("Helvetica", 16, "bold"), fill="green")
-            self.btn_iniciar_demo.config(state="normal")
-        elif intento < self.demo_secreto:
-            # Dibujar flecha hacia la derecha
-            self.canvas.create_line(x_pos, 130, x_pos+50, 130, arrow=tk.LAST, tags="marcador")
-            self.lbl_demo_info.config(text="El número es MAYOR. Descartamos todos los números menores o iguales al intento actual.")
-            
-            # Colorear área descartada
-            self.canvas.create_rectangle(50, 150, x_pos, 180, fill="lightgray", tags="marcador")
-            self.canvas.create_text((50+x_pos)/2, 165, text="Descartado", tags="marcador")
-            
-            # Siguiente paso
-            self.root.after(1500, lambda: self.ejecutar_paso_demo(intento + 1, max_actual, paso + 1))
-        else:  # intento > self.demo_secreto
-            # Dibujar flecha hacia la izquierda
-            self.canvas.create_line(x_pos, 130, x_pos-50, 130, arrow=tk.LAST, tags="marcador")
-            self.lbl_demo_info.config(text="El número es MENOR. Descartamos todos los números mayores o iguales al intento actual.")
-            
-            # Colorear área descartada
-            self.canvas.create_rectangle(x_pos, 150, 750, 180, fill="lightgray", tags="marcador")
-            self.canvas.create_text((x_pos+750)/2, 165, text="Descartado", tags="marcador")
-            
-            # Siguiente paso
-            self.root.after(1500, lambda: self.ejecutar_paso_demo(min_actual, intento - 1, paso + 1))
+        # Mover el marcador, mostrar el resultado y dejar tiempo para leerlo.
+        # El siguiente paso se agrega al final de la cola desde verificar().
+        self.planificador_demo.agregar(Accion(preparar), Interpolacion(0.6, mover), Espera(0.4),
+                                       Accion(verificar), Espera(1.5), Hito())
+    
+    def alternar_pausa_demo(self):
+        if not self.planificador_demo.activo:
+            return
+        if self.planificador_demo.pausado:
+            self.planificador_demo.reanudar()
+            self.btn_pausa_demo.config(text="Pausar")
+        else:
+            self.planificador_demo.pausar()
+            self.btn_pausa_demo.config(text="Reanudar")
+    
+    def paso_demo(self):
+        # Avanza hasta el final del paso actual y queda en pausa
+        if not self.planificador_demo.activo:
+            return
+        self.planificador_demo.paso()
+        self.btn_pausa_demo.config(text="Reanudar")
+    
+    def cambiar_velocidad_demo(self):
+        self.planificador_demo.velocidad = float(self.velocidad_demo_var.get().rstrip("x"))
+    
+    def detener_demo(self):
+        # Cancela las animaciones pendientes sin dejar nada a medias
+        self.planificador_demo.cancelar()
+        self.planificador_demo.pausado = False
+        self.btn_pausa_demo.config(text="Pausar")
+        self.btn_iniciar_demo.config(state="normal")
+    
+    def salir_demo(self):
+        self.detener_demo()
+        self.mostrar_frame(self.frame_menu)
     
     def volver_al_menu(self):
         if self.jugando:
@@ -499,7 +519,8 @@ class JuegoAdivinanza:
             if not respuesta:
                 return
         
-        self.jugando = False
+        if self.sesion is not None:
+            self.sesion.abandonar()
         self.mostrar_frame(self.frame_menu)
 
 # Iniciar la aplicación
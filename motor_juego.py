@@ -0,0 +1,181 @@
+import itertools
+import math
+import random
+from array import array
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Rango que cabe en un array('q'); con límites más grandes el historial es una lista
+_MINIMO_Q = -2 ** 63
+_MAXIMO_Q = 2 ** 63 - 1
+
+# Resultados posibles de un intento
+BAJO = "bajo"
+ALTO = "alto"
+CORRECTO = "correcto"
+FUERA_DE_RANGO = "fuera_de_rango"
+
+
+class ResultadoIntento(NamedTuple):
+    resultado: str
+    intento: int
+    # Número de intento (1, 2, ...); 0 si no contó por estar fuera de rango
+    numero: int
+    intentos_restantes: int
+    terminado: bool
+    puntuacion: int
+    # Números que todavía pueden ser el secreto después del intento
+    posibles: int = 0
+    # Información que aportó el intento: log2(posibles antes / posibles después)
+    bits: float = 0.0
+    # El número ya estaba descartado por intentos anteriores: no aportó nada
+    desperdiciado: bool = False
+
+
+def calcular_puntuacion(limite_inferior, limite_superior, intentos_maximos, intentos_usados):
+    # La misma fórmula de siempre: más puntos cuantos menos intentos se usan
+    # y cuanto más amplio es el rango.
+    factor_dificultad = (limite_superior - limite_inferior) / 100
+    return int((1000 / intentos_maximos) * (intentos_maximos - intentos_usados + 1) * factor_dificultad)
+
+
+class SesionJuego:
+    """Estado de una partida, sin nada de interfaz.
+    
+    Con __slots__ y el historial en un array de enteros cada sesión ocupa
+    unos pocos cientos de bytes, así que se pueden tener miles en memoria.
+    """
+    
+    __slots__ = ('limite_inferior', 'limite_superior', 'intentos_maximos', 'intentos_restantes',
+                 'numero_secreto', 'intentos', 'jugando', 'puntuacion', 'min_actual', 'max_actual')
+    
+    def __init__(self, limite_inferior, limite_superior, intentos_maximos, azar=random):
+        # Las mismas validaciones que la pantalla de configuración
+        if limite_inferior >= limite_superior:
+            raise ValueError("El límite inferior debe ser menor que el límite superior.")
+        if intentos_maximos <= 0:
+            raise ValueError("El número de intentos debe ser mayor que cero.")
+        
+        self.limite_inferior = limite_inferior
+        self.limite_superior = limite_superior
+        self.intentos_maximos = intentos_maximos
+        self.intentos_restantes = intentos_maximos
+        self.numero_secreto = azar.randint(limite_inferior, limite_superior)
+        if _MINIMO_Q <= limite_inferior and limite_superior <= _MAXIMO_Q:
+            self.intentos = array('q')
+        else:
+            self.intentos = []
+        self.jugando = True
+        self.puntuacion = 0
+        # Rango donde todavía puede estar el secreto; se achica con cada
+        # intento, así la pista no tiene que repasar el historial.
+        self.min_actual = limite_inferior
+        self.max_actual = limite_superior
+    
+    @property
+    def intentos_usados(self):
+        return self.intentos_maximos - self.intentos_restantes
+    
+    @property
+    def posibles(self):
+        return self.max_actual - self.min_actual + 1
+    
+    def intentar(self, intento) -> Optional[ResultadoIntento]:
+        """Registra un intento y dice si fue bajo, alto o correcto.
+        
+        Un número fuera del rango no gasta intento. Devuelve None si la
+        partida ya terminó.
+        """
+        if not self.jugando:
+            return None
+        if intento < self.limite_inferior or intento > self.limite_superior:
+            return ResultadoIntento(FUERA_DE_RANGO, intento, 0, self.intentos_restantes, False, 0)
+        
+        self.intentos.append(intento)
+        self.intentos_restantes -= 1
+        posibles_antes = self.posibles
+        desperdiciado = intento < self.min_actual or intento > self.max_actual
+        
+        if intento < self.numero_secreto:
+            resultado = BAJO
+            self.min_actual = max(self.min_actual, intento + 1)
+        elif intento > self.numero_secreto:
+            resultado = ALTO
+            self.max_actual = min(self.max_actual, intento - 1)
+        else:
+            resultado = CORRECTO
+            self.min_actual = self.max_actual = intento
+            self.jugando = False
+            self.puntuacion = calcular_puntuacion(self.limite_inferior, self.limite_superior,
+                                                  self.intentos_maximos, self.intentos_usados)
+        if self.intentos_restantes == 0:
+            self.jugando = False
+        posibles = self.posibles
+        bits = math.log2(posibles_antes / posibles) if posibles != posibles_antes else 0.0
+        return ResultadoIntento(resultado, intento, len(self.intentos), self.intentos_restantes,
+                                not self.jugando, self.puntuacion, posibles, bits, desperdiciado)
+    
+    def pista(self) -> Optional[Tuple[int, int, int]]:
+        """Sugerencia de búsqueda binaria: (sugerencia, mínimo posible, máximo posible).
+        
+        None si la partida terminó o todavía no hay intentos.
+        """
+        if not self.jugando or len(self.intentos) == 0:
+            return None
+        return (self.min_actual + self.max_actual) // 2, self.min_actual, self.max_actual
+    
+    def bits_restantes(self):
+        """Información que falta para dar con el secreto: log2 de los números posibles."""
+        return math.log2(self.posibles)
+    
+    def abandonar(self):
+        self.jugando = False
+
+
+class MotorJuego:
+    """Muchas sesiones de juego en memoria, identificadas por un número.
+    
+    Uso::
+        
+        motor = MotorJuego()
+        sesion = motor.crear(1, 100, 10)
+        motor.intentar(sesion, 50)
+        motor.pista(sesion)
+        motor.terminar(sesion)
+    """
+    
+    def __init__(self, semilla=None):
+        self.azar = random.Random(semilla)
+        self.sesiones: Dict[int, SesionJuego] = {}
+        self._ids = itertools.count(1)
+    
+    def __len__(self):
+        return len(self.sesiones)
+    
+    def crear(self, limite_inferior, limite_superior, intentos_maximos) -> int:
+        sesion = SesionJuego(limite_inferior, limite_superior, intentos_maximos, self.azar)
+        id_sesion = next(self._ids)
+        self.sesiones[id_sesion] = sesion
+        return id_sesion
+    
+    def obtener(self, id_sesion) -> SesionJuego:
+        try:
+            return self.sesiones[id_sesion]
+        except KeyError:
+            raise KeyError(f"No existe la sesión {id_sesion}") from None
+    
+    def intentar(self, id_sesion, intento) -> Optional[ResultadoIntento]:
+        return self.obtener(id_sesion).intentar(intento)
+    
+    def pista(self, id_sesion) -> Optional[Tuple[int, int, int]]:
+        return self.obtener(id_sesion).pista()
+    
+    def terminar(self, id_sesion) -> Optional[SesionJuego]:
+        """Quita la sesión del motor y la devuelve (None si no existía)."""
+        return self.sesiones.pop(id_sesion, None)
+    
+    def limpiar_terminadas(self) -> int:
+        """Quita las sesiones que ya no se están jugando. Devuelve cuántas quitó."""
+        terminadas = [id_sesion for id_sesion, sesion in self.sesiones.items() if not sesion.jugando]
+        for id_sesion in terminadas:
+            del self.sesiones[id_sesion]
+        return len(terminadas)
@@ -1,102 +1,557 @@
+import argparse
 import csv
+import io
 import os
-from typing import List, Optional
+import sys
+from contextlib import contextmanager, redirect_stdout
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
 
-class Contacto:
-    """Clase que representa un contacto con nombre, email y teléfono."""
-    
-    def __init__(self, nombre: str, email: str, telefono: str):
-        self.nombre = nombre
-        self.email = email
-        self.telefono = telefono
-    
-    def __str__(self):
-        return f"{self.nombre} - {self.email} - {self.telefono}"
-    
-    def to_dict(self):
-        """Convierte el contacto a un diccionario para CSV."""
-        return {
-            'nombre': self.nombre,
-            'email': self.email,
-            'telefono': self.telefono
-        }
-    
-    @classmethod
-    def from_dict(cls, data: dict):
-        """Crea un contacto desde un diccionario de CSV."""
-        return cls(data['nombre'], data['email'], data['telefono'])
+from almacenamiento import AlmacenContactos, AlmacenCSV, ErrorGuardado
+from busqueda import ConstruccionIndice, IndiceBusqueda
+from consultas import Consulta
+from contacto import Contacto, clave_nombre
+from importacion import FilaImportada, leer_csv_en_paralelo, validar_filas
+from metricas import Metricas, medido
+from normalizacion import IndiceNormalizado
+from transacciones import Campos, Transaccion
+from validacion import validar_email, validar_telefono
+
+# Formatos de salida de los subcomandos y filas que se juntan por escritura.
+FORMATOS = ('texto', 'csv', 'jsonl')
+FILAS_POR_ESCRITURA = 1000
+
+
+class ResultadoFila(NamedTuple):
+    """Resultado de una fila procesada por una operación en lote."""
+    posicion: int
+    nombre: str
+    aceptada: bool
+    motivo: str
 
 
 class GestorContactos:
-    """Clase principal para gestionar los contactos."""
+    """Clase principal para gestionar los contactos.
+    
+    Los contactos se guardan en un almacén intercambiable (ver
+    almacenamiento.py). Por defecto es un AlmacenCSV sobre ``archivo_csv``
+    con las opciones usar_diario, perezoso, columnar, compartido,
+    al_conflicto y usar_instantanea; también se puede pasar cualquier otro,
+    por ejemplo ``GestorContactos(almacen=AlmacenSQLite())``.
     
-    def __init__(self, archivo_csv: str = 'contactos.csv'):
-        self.archivo_csv = archivo_csv
-        self.contactos: List[Contacto] = []
+    Con ``metricas=Metricas()`` se registran tiempos por operación, bytes,
+    filas y aciertos de los índices (ver metricas.py); sin ellas no se mide
+    nada.
+    """
+    
+    def __init__(self, archivo_csv: str = 'contactos.csv', usar_diario: bool = False,
+                 limite_diario: int = 1024 * 1024, perezoso: bool = False,
+                 columnar: bool = False, compartido: bool = False,
+                 al_conflicto: str = 'fusionar', usar_instantanea: bool = False,
+                 almacen: Optional[AlmacenContactos] = None, metricas: Optional[Metricas] = None):
+        if almacen is None:
+            almacen = AlmacenCSV(archivo_csv, usar_diario, limite_diario, perezoso, columnar,
+                                 compartido, al_conflicto, usar_instantanea)
+        self.almacen = almacen
+        self._metricas = metricas
+        almacen.metricas = metricas
+        # Dentro de un lote los cambios se acumulan y se persisten al final.
+        self._nivel_lote = 0
+        self._cambios_pendientes: List[Tuple[str, ...]] = []
+        # Índice de búsqueda por prefijo y aproximada; se construye la
+        # primera vez que se usa (o en segundo plano, ver preparar_busqueda)
+        # y después se mantiene al día.
+        self._busqueda: Optional[IndiceBusqueda] = None
+        self._construccion: Optional[ConstruccionIndice] = None
+        # Índices de emails y teléfonos normalizados; también perezosos.
+        self._normalizado: Optional[IndiceNormalizado] = None
+        # Generación del almacén sobre la que se construyeron los índices.
+        self._generacion = -1
         self.cargar_contactos()
     
+    @staticmethod
+    def _clave(nombre: str) -> str:
+        """Normaliza un nombre para usarlo como clave del índice."""
+        return clave_nombre(nombre)
+    
+    @property
+    def contactos(self) -> List[Contacto]:
+        """Lista de contactos en el orden en que fueron cargados o agregados.
+        
+        Es una copia nueva en cada acceso: para recorrerlos conviene
+        ``iterar_contactos()`` y para contarlos ``len(gestor.almacen)``.
+        """
+        return list(self.iterar_contactos())
+    
+    def iterar_contactos(self) -> Iterator[Contacto]:
+        """Recorre los contactos en orden sin construir una lista intermedia."""
+        return self.almacen.iterar()
+    
+    def consultar(self) -> Consulta:
+        """Consulta perezosa sobre todos los contactos (ver consultas.py).
+        
+        Por ejemplo ``gestor.consultar().con_dominio('gmail.com').exportar_csv('gmail.csv')``
+        recorre el almacén una vez sin copiarlo y sin tocar el CSV principal.
+        """
+        return Consulta(self.almacen.iterar_campos)
+    
+    def _poner(self, clave: str, contacto: Contacto):
+        """Guarda un contacto en el almacén y en los índices auxiliares."""
+        self.almacen.upsert(clave, contacto)
+        self._indexar(clave, contacto)
+    
+    def _quitar(self, clave: str) -> Optional[Contacto]:
+        """Saca un contacto del almacén y de los índices auxiliares."""
+        contacto = self.almacen.eliminar(clave)
+        if contacto is not None:
+            self._desindexar(clave)
+        return contacto
+    
+    def _indexar(self, clave: str, contacto: Contacto):
+        """Actualiza los índices auxiliares que ya estén construidos."""
+        if self._busqueda is not None:
+            self._busqueda.agregar(clave, contacto.nombre)
+        elif self._construccion is not None:
+            self._construccion.agregar(clave, contacto.nombre)
+        if self._normalizado is not None:
+            self._normalizado.agregar(clave, contacto.email, contacto.telefono)
+    
+    def _desindexar(self, clave: str):
+        if self._busqueda is not None:
+            self._busqueda.eliminar(clave)
+        elif self._construccion is not None:
+            self._construccion.eliminar(clave)
+        if self._normalizado is not None:
+            self._normalizado.eliminar(clave)
+    
+    def _revisar_indices(self):
+        """Descarta los índices auxiliares si el almacén se recargó por su cuenta.
+        
+        Pasa, por ejemplo, cuando al guardar se fusionan cambios de otro
+        proceso: los contactos en memoria se reemplazan y los índices ya no
+        corresponden a ellos.
+        """
+        if self._generacion != self.almacen.generacion:
+            self._descartar_indices()
+            self._generacion = self.almacen.generacion
+    
+    def _descartar_indices(self):
+        if self._construccion is not None:
+            self._construccion.cancelar()
+            self._construccion = None
+        self._busqueda = None
+        self._normalizado = None
+    
+    @medido('cargar')
     def cargar_contactos(self):
-        """Carga los contactos desde el archivo CSV."""
-        if os.path.exists(self.archivo_csv):
-            try:
-                with open(self.archivo_csv, 'r', newline='', encoding='utf-8') as archivo:
-                    reader = csv.DictReader(archivo)
-                    self.contactos = [Contacto.from_dict(fila) for fila in reader]
-                print(f"Se cargaron {len(self.contactos)} contactos desde {self.archivo_csv}")
-            except Exception as e:
-                print(f"Error al cargar contactos: {e}")
-                self.contactos = []
+        """Carga los contactos desde el almacén."""
+        self._descartar_indices()
+        self.almacen.cargar()
+    
+    @medido('refrescar')
+    def refrescar(self) -> bool:
+        """Se pone al día con los cambios de otros procesos. Devuelve True si había alguno.
+        
+        Es barato llamarlo seguido: si nada cambió en disco solo se comparan
+        fechas y tamaños, y si algo cambió se aplican únicamente las filas
+        nuevas, modificadas o eliminadas, también en los índices.
+        """
+        cambios = self.almacen.refrescar_incremental()
+        if cambios is None:
+            self._revisar_indices()
+            return True
+        for cambio in cambios:
+            clave = self._clave(cambio[1])
+            if cambio[0] == 'D':
+                self._desindexar(clave)
+            else:
+                self._indexar(clave, Contacto(*cambio[1:]))
+        return bool(cambios)
+    
+    @medido('guardar')
+    def guardar_contactos(self) -> bool:
+        """Guarda todos los contactos en el almacén."""
+        try:
+            return self.almacen.guardar()
+        finally:
+            self._revisar_indices()
+    
+    def verificar_instantanea(self) -> bool:
+        """Comprueba con el resumen del CSV la instantánea usada al cargar.
+        
+        Al arrancar solo se comparan tamaño, fecha e inodo del CSV; esto lo
+        lee completo. Si la instantánea no corresponde, los contactos se
+        vuelven a cargar desde el CSV. Devuelve False en ese caso y True si
+        estaba bien o el almacén no usa instantánea.
+        """
+        correcta = self.almacen.verificar_instantanea()
+        if correcta is None:
+            print("El almacén no usa instantánea")
+            return True
+        if correcta:
+            print("La instantánea corresponde al CSV")
+            return True
+        print("La instantánea no corresponde al CSV; se cargan los contactos desde el CSV")
+        self.cargar_contactos()
+        return False
+    
+    def cerrar(self):
+        """Libera los recursos abiertos por el gestor."""
+        self.almacen.cerrar()
+    
+    def _registrar_cambio(self, operacion: str, contacto: Contacto):
+        """Registra un cambio para persistirlo ahora o al cerrar el lote actual.
+        
+        La operación es 'U' (alta o modificación) o 'D' (eliminación). Se
+        guarda una copia de los campos y no el objeto, que puede ser una vista
+        sobre una fila que se reutilice más adelante.
+        """
+        if operacion == 'U':
+            cambio = ('U', contacto.nombre, contacto.email, contacto.telefono)
+        else:
+            cambio = ('D', contacto.nombre)
+        if self._nivel_lote:
+            self._cambios_pendientes.append(cambio)
         else:
-            print(f"Archivo {self.archivo_csv} no encontrado. Se creará uno nuevo.")
-            self.contactos = []
+            self._persistir([cambio])
     
-    def guardar_contactos(self):
-        """Guarda todos los contactos en el archivo CSV."""
+    @contextmanager
+    def lote(self):
+        """Agrupa varias operaciones para persistirlas una sola vez al final.
+        
+        Uso::
+            
+            with gestor.lote():
+                gestor.agregar_contacto(...)
+                gestor.eliminar_contacto(...)
+        
+        Los lotes se pueden anidar; solo el más externo escribe en disco.
+        Si esa escritura falla, al salir se lanza ErrorGuardado (ver
+        confirmar_pendientes).
+        """
+        self._nivel_lote += 1
+        try:
+            yield self
+        finally:
+            self._nivel_lote -= 1
+            if self._nivel_lote == 0:
+                self.confirmar_pendientes()
+    
+    def confirmar_pendientes(self) -> int:
+        """Persiste ya los cambios acumulados del lote abierto. Devuelve cuántos eran.
+        
+        Sirve a quien mantiene un lote abierto mucho tiempo (por ejemplo el
+        servicio de red) y quiere guardar cada cierto intervalo. Si no se
+        pudieron guardar, los cambios vuelven a quedar pendientes (se
+        reintentan en el próximo guardado) y se lanza ErrorGuardado.
+        """
+        if not self._cambios_pendientes:
+            return 0
+        cambios, self._cambios_pendientes = self._cambios_pendientes, []
         try:
-            with open(self.archivo_csv, 'w', newline='', encoding='utf-8') as archivo:
-                if self.contactos:
-                    fieldnames = ['nombre', 'email', 'telefono']
-                    writer = csv.DictWriter(archivo, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for contacto in self.contactos:
-                        writer.writerow(contacto.to_dict())
-                print(f"Contactos guardados exitosamente en {self.archivo_csv}")
-        except Exception as e:
-            print(f"Error al guardar contactos: {e}")
+            guardado = self._persistir(cambios)
+        except Exception:
+            self._cambios_pendientes[:0] = cambios
+            raise
+        if not guardado:
+            self._cambios_pendientes[:0] = cambios
+            raise ErrorGuardado(f"No se pudieron guardar {len(cambios)} cambios")
+        return len(cambios)
     
+    @medido('persistir')
+    def _persistir(self, cambios: List[Tuple[str, ...]], atomico: bool = False) -> bool:
+        if self._metricas is not None:
+            self._metricas.sumar('cambios_persistidos', len(cambios))
+        try:
+            return self.almacen.confirmar(cambios, atomico)
+        finally:
+            self._revisar_indices()
+    
+    def transaccion(self) -> Transaccion:
+        """Abre una transacción de altas, ediciones y bajas (ver transacciones.py)."""
+        return Transaccion(self)
+    
+    @medido('transaccion')
+    def _aplicar_transaccion(self, estado: Dict[str, Campos]) -> bool:
+        """Aplica el estado final de cada contacto de una transacción y lo guarda de una vez.
+        
+        Si la escritura falla se restauran los contactos como estaban (los
+        eliminados vuelven al final del orden), para que la memoria no se
+        aparte de lo que hay en disco. Dentro de un lote
+        los cambios se suman a los pendientes y se guardan con él.
+        """
+        anteriores: Dict[str, Campos] = {}
+        cambios: List[Tuple[str, ...]] = []
+        for clave, campos in estado.items():
+            previo = self.almacen.obtener(clave)
+            anteriores[clave] = None if previo is None else (previo.nombre, previo.email, previo.telefono)
+            if campos is not None:
+                self._poner(clave, Contacto(*campos))
+                cambios.append(('U', *campos))
+            elif previo is not None:
+                self._quitar(clave)
+                cambios.append(('D', previo.nombre))
+        if not cambios:
+            return True
+        if self._nivel_lote:
+            self._cambios_pendientes.extend(cambios)
+            return True
+        
+        try:
+            guardado = self._persistir(cambios, atomico=True)
+        except Exception:
+            self._restaurar(anteriores)
+            raise
+        if not guardado:
+            self._restaurar(anteriores)
+        return guardado
+    
+    def _restaurar(self, anteriores: Dict[str, Campos]):
+        for clave, campos in anteriores.items():
+            if campos is None:
+                self._quitar(clave)
+            else:
+                self._poner(clave, Contacto(*campos))
+    
+    def metricas(self) -> dict:
+        """Instantánea de las métricas (vacía si se creó sin ``metricas``)."""
+        return self._metricas.instantanea() if self._metricas is not None else {}
+    
+    @medido('agregar')
     def agregar_contacto(self, nombre: str, email: str, telefono: str):
         """Agrega un nuevo contacto."""
         # Verificar si ya existe un contacto con el mismo nombre
-        if self.buscar_contacto_por_nombre(nombre):
+        clave = self._clave(nombre)
+        if clave in self.almacen:
             print(f"Ya existe un contacto con el nombre '{nombre}'")
             return False
         
         nuevo_contacto = Contacto(nombre, email, telefono)
-        self.contactos.append(nuevo_contacto)
-        self.guardar_contactos()
+        self._poner(clave, nuevo_contacto)
+        self._registrar_cambio('U', nuevo_contacto)
         print(f"Contacto '{nombre}' agregado exitosamente")
         return True
     
-    def listar_contactos(self):
-        """Lista todos los contactos."""
-        if not self.contactos:
+    @medido('agregar_lote')
+    def agregar_contactos(self, filas: Iterable[Tuple[str, str, str]],
+                          actualizar: bool = False) -> List[ResultadoFila]:
+        """Agrega muchos contactos de una vez y los guarda una sola vez.
+        
+        Cada fila es una tupla (nombre, email, teléfono). Las filas con campos
+        vacíos, email o teléfono inválidos se rechazan (con las mismas reglas
+        que importar_csv), igual que los nombres repetidos (ya existentes o
+        repetidos dentro del mismo lote) salvo que ``actualizar`` sea True, en
+        cuyo caso se sobrescriben el email y el teléfono del contacto existente.
+        Devuelve un ResultadoFila por cada fila recibida, en el mismo orden.
+        """
+        return self._incorporar(self._validadas(filas), actualizar)
+    
+    @staticmethod
+    def _validadas(filas: Iterable[Tuple[str, str, str]]) -> Iterator[FilaImportada]:
+        """Valida filas (nombre, email, teléfono) por bloques con validar_filas, sin leerlas todas antes."""
+        filas = iter(filas)
+        while True:
+            bloque = list(islice(filas, FILAS_POR_ESCRITURA))
+            if not bloque:
+                return
+            nombres, emails, telefonos = (list(columna) for columna in zip(*bloque))
+            yield from validar_filas(nombres, emails, telefonos)
+    
+    @medido('importar')
+    def importar_csv(self, ruta: str, actualizar: bool = False,
+                     procesos: Optional[int] = None) -> List[ResultadoFila]:
+        """Importa un CSV con columnas nombre, email y telefono.
+        
+        La lectura, validación y normalización se reparten entre ``procesos``
+        procesos (por defecto uno por núcleo, ver importacion.py); después las
+        filas se incorporan en el orden del archivo como en agregar_contactos,
+        rechazando además emails y teléfonos inválidos. Las posiciones de los
+        resultados cuentan las filas de datos desde 0, sin la cabecera.
+        """
+        try:
+            rangos = leer_csv_en_paralelo(ruta, procesos)
+        except (OSError, ValueError) as e:
+            print(f"Error al importar {ruta}: {e}")
+            return []
+        return self._incorporar((fila for filas in rangos for fila in filas), actualizar)
+    
+    def _incorporar(self, filas: Iterable[FilaImportada], actualizar: bool) -> List[ResultadoFila]:
+        """Agrega filas ya normalizadas (nombre, email, teléfono, motivo de rechazo).
+        
+        Si al final no se pudo guardar, las filas aceptadas se informan como
+        rechazadas con el motivo "no se pudo guardar"; esos cambios quedan en
+        memoria y pendientes, y se reintentan en el próximo guardado.
+        """
+        resultados: List[ResultadoFila] = []
+        try:
+            with self.lote():
+                self._incorporar_filas(filas, actualizar, resultados)
+        except ErrorGuardado as e:
+            print(f"Error al guardar el lote: {e}")
+            resultados = [ResultadoFila(r.posicion, r.nombre, False, "no se pudo guardar") if r.aceptada else r
+                          for r in resultados]
+        
+        aceptadas = sum(1 for resultado in resultados if resultado.aceptada)
+        print(f"Lote procesado: {aceptadas} aceptados, {len(resultados) - aceptadas} rechazados")
+        return resultados
+    
+    def _incorporar_filas(self, filas: Iterable[FilaImportada], actualizar: bool,
+                          resultados: List[ResultadoFila]):
+        """Aplica cada fila y anota su ResultadoFila, dentro del lote abierto por _incorporar."""
+        for posicion, (nombre, email, telefono, motivo) in enumerate(filas):
+            if motivo is not None:
+                resultados.append(ResultadoFila(posicion, nombre, False, motivo))
+                continue
+            
+            clave = self._clave(nombre)
+            existente = self.almacen.obtener(clave)
+            if existente is None:
+                contacto = Contacto(nombre, email, telefono)
+                self._poner(clave, contacto)
+                self._registrar_cambio('U', contacto)
+                resultados.append(ResultadoFila(posicion, nombre, True, "agregado"))
+            elif actualizar:
+                existente.email = email
+                existente.telefono = telefono
+                self._poner(clave, existente)
+                self._registrar_cambio('U', existente)
+                resultados.append(ResultadoFila(posicion, nombre, True, "actualizado"))
+            else:
+                resultados.append(ResultadoFila(posicion, nombre, False, "nombre repetido"))
+    
+    @medido('listar')
+    def listar_contactos(self, limite: Optional[int] = None, desplazamiento: int = 0):
+        """Lista los contactos, todos o ``limite`` a partir del número ``desplazamiento``.
+        
+        Las filas se escriben en bloques (ver escribir_contactos) en lugar de
+        un print por contacto.
+        """
+        if not len(self.almacen):
             print("No hay contactos registrados")
             return
         
         print("\n" + "="*60)
         print("LISTA DE CONTACTOS")
         print("="*60)
-        for i, contacto in enumerate(self.contactos, 1):
-            print(f"{i}. {contacto}")
+        campos = ((contacto.nombre, contacto.email, contacto.telefono) for contacto in self.iterar_contactos())
+        fin = None if limite is None else desplazamiento + limite
+        escribir_contactos(islice(campos, desplazamiento, fin), sys.stdout, 'texto', desplazamiento + 1)
         print("="*60)
     
+    @medido('obtener')
     def buscar_contacto_por_nombre(self, nombre: str) -> Optional[Contacto]:
-        """Busca un contacto por nombre."""
-        for contacto in self.contactos:
-            if contacto.nombre.lower() == nombre.lower():
-                return contacto
-        return None
+        """Busca un contacto por nombre (sin distinguir mayúsculas)."""
+        contacto = self.almacen.obtener(self._clave(nombre))
+        if self._metricas is not None:
+            self._metricas.acierto('indice_nombre', contacto is not None)
+        return contacto
     
+    def preparar_busqueda(self):
+        """Empieza a construir el índice de búsqueda en un hilo aparte.
+        
+        Con cientos de miles de contactos construirlo lleva varios segundos;
+        la interfaz lo pide al arrancar para que se arme mientras el usuario
+        usa el menú, y la primera búsqueda solo espera lo que falte.
+        """
+        self._revisar_indices()
+        if self._busqueda is None and self._construccion is None:
+            self._construccion = ConstruccionIndice([(clave, clave) for clave in self.almacen.claves()])
+    
+    @medido('buscar')
+    def buscar_contactos(self, texto: str, limite: int = 10) -> List[Contacto]:
+        """Busca contactos por parte del nombre, sin distinguir tildes.
+        
+        Acepta prefijos de cualquier palabra ("Perez" encuentra "Juan Pérez")
+        y tolera errores de escritura. Devuelve hasta ``limite`` contactos,
+        los más parecidos primero.
+        """
+        self._revisar_indices()
+        if self._construccion is not None:
+            self._busqueda = self._construccion.terminar()
+            self._construccion = None
+        elif self._busqueda is None:
+            # La clave ya es el nombre en minúsculas, así que se puede
+            # indexar sin decodificar cada contacto.
+            self._busqueda = IndiceBusqueda()
+            self._busqueda.agregar_muchos((clave, clave) for clave in self.almacen.claves())
+        encontrados = [self.almacen.obtener(clave) for clave, _ in self._busqueda.buscar(texto, limite)]
+        if self._metricas is not None:
+            self._metricas.acierto('indice_busqueda', bool(encontrados))
+        return encontrados
+    
+    def _indice_normalizado(self) -> IndiceNormalizado:
+        """Índice de emails y teléfonos normalizados, construido al primer uso."""
+        self._revisar_indices()
+        if self._normalizado is None:
+            self._normalizado = IndiceNormalizado()
+            self._normalizado.agregar_muchos((self._clave(contacto.nombre), contacto.email, contacto.telefono)
+                                             for contacto in self.iterar_contactos())
+        return self._normalizado
+    
+    @medido('buscar_email')
+    def buscar_por_email(self, email: str) -> List[Contacto]:
+        """Contactos con ese email, sin distinguir mayúsculas ni espacios.
+        
+        Si el almacén tiene su propio índice (SQLite) se consulta ese, sin
+        cargar los contactos; si no, el índice en memoria.
+        """
+        claves = self.almacen.claves_con_email(email)
+        if claves is None:
+            claves = self._indice_normalizado().con_email(email)
+        if self._metricas is not None:
+            self._metricas.acierto('indice_email', bool(claves))
+        return [self.almacen.obtener(clave) for clave in claves]
+    
+    @medido('buscar_telefono')
+    def buscar_por_telefono(self, telefono: str) -> List[Contacto]:
+        """Contactos con ese teléfono, escrito de cualquier forma ("+57 311..." o "311...").
+        
+        Como buscar_por_email, usa el índice del almacén si lo tiene.
+        """
+        claves = self.almacen.claves_con_telefono(telefono)
+        if claves is None:
+            claves = self._indice_normalizado().con_telefono(telefono)
+        if self._metricas is not None:
+            self._metricas.acierto('indice_telefono', bool(claves))
+        return [self.almacen.obtener(clave) for clave in claves]
+    
+    @medido('deduplicar')
+    def deduplicar(self, aplicar: bool = True) -> List[Tuple[str, List[str]]]:
+        """Elimina los contactos que repiten el email o el teléfono de otro.
+        
+        Recorre los contactos en orden: el primero que usa un email o
+        teléfono (normalizados) se conserva, y se eliminan los posteriores
+        que coinciden directamente con él. Un contacto que solo coincide con
+        otro eliminado se conserva, así que no se pierden emails ni
+        teléfonos que no estén en otro contacto. No se combinan campos: el
+        contacto conservado queda como estaba. Con ``aplicar=False`` solo se
+        informa qué se eliminaría. Devuelve pares (nombre conservado,
+        nombres eliminados). Usa los índices hash, sin comparar los contactos
+        de a pares, así que sirve para listas de millones de filas.
+        """
+        duplicados = self._indice_normalizado().duplicados_directos(self.almacen.claves())
+        if not duplicados:
+            print("No se encontraron contactos duplicados")
+            return []
+        
+        grupos: List[Tuple[str, List[str]]] = []
+        with self.lote():
+            for conservada, sobrantes in duplicados.items():
+                eliminados = []
+                for clave in sobrantes:
+                    contacto = self._quitar(clave) if aplicar else self.almacen.obtener(clave)
+                    if aplicar:
+                        self._registrar_cambio('D', contacto)
+                    eliminados.append(contacto.nombre)
+                grupos.append((self.almacen.obtener(conservada).nombre, eliminados))
+        
+        total = sum(len(eliminados) for _, eliminados in grupos)
+        accion = "Se eliminaron" if aplicar else "Se eliminarían"
+        print(f"{accion} {total} contactos duplicados en {len(grupos)} grupos")
+        return grupos
+    
+    @medido('editar')
     def editar_contacto(self, nombre: str, nuevo_email: str = None, nuevo_telefono: str = None):
         """Edita un contacto existente."""
         contacto = self.buscar_contacto_por_nombre(nombre)
@@ -109,19 +564,22 @@ class GestorContactos:
         if nuevo_telefono:
             contacto.telefono = nuevo_telefono
         
-        self.guardar_contactos()
+        # El contacto puede ser una copia (modo perezoso, SQLite): se vuelve
+        # a guardar en el almacén para no perder la modificación.
+        self._poner(self._clave(contacto.nombre), contacto)
+        self._registrar_cambio('U', contacto)
         print(f"Contacto '{nombre}' editado exitosamente")
         return True
     
+    @medido('eliminar')
     def eliminar_contacto(self, nombre: str):
         """Elimina un contacto por nombre."""
-        contacto = self.buscar_contacto_por_nombre(nombre)
-        if not contacto:
+        contacto = self._quitar(self._clave(nombre))
+        if contacto is None:
             print(f"No se encontró el contacto '{nombre}'")
             return False
         
-        self.contactos.remove(contacto)
-        self.guardar_contactos()
+        self._registrar_cambio('D', contacto)
         print(f"Contacto '{nombre}' eliminado exitosamente")
         return True
 
@@ -129,8 +587,10 @@ class GestorContactos:
 class AplicacionContactos:
     """Clase principal de la aplicación de consola."""
     
-    def __init__(self):
-        self.gestor = GestorContactos()
+    def __init__(self, gestor: Optional[GestorContactos] = None, pausar: bool = True):
+        self.gestor = gestor if gestor is not None else GestorContactos()
+        # Sin pausa el menú se puede manejar con la entrada redirigida.
+        self.pausar = pausar
     
     def mostrar_menu(self):
         """Muestra el menú principal."""
@@ -147,11 +607,11 @@ class AplicacionContactos:
     
     def validar_email(self, email: str) -> bool:
         """Validación básica de email."""
-        return "@" in email and "." in email.split("@")[1]
+        return validar_email(email)
     
     def validar_telefono(self, telefono: str) -> bool:
         """Validación básica de teléfono."""
-        return telefono.replace("-", "").replace(" ", "").replace("(", "").replace(")", "").isdigit()
+        return validar_telefono(telefono)
     
     def obtener_datos_contacto(self):
         """Obtiene los datos de un nuevo contacto con validación."""
@@ -238,12 +698,20 @@ class AplicacionContactos:
         contacto = self.gestor.buscar_contacto_por_nombre(nombre)
         if contacto:
             print(f"Contacto encontrado: {contacto}")
+            return
+        
+        coincidencias = self.gestor.buscar_contactos(nombre)
+        if coincidencias:
+            print(f"No hay un contacto llamado '{nombre}'. Coincidencias:")
+            for i, contacto in enumerate(coincidencias, 1):
+                print(f"{i}. {contacto}")
         else:
             print(f"No se encontró el contacto '{nombre}'")
     
     def ejecutar(self):
         """Ejecuta la aplicación principal."""
         print("¡Bienvenido a la Gestión de Contactos!")
+        self.gestor.preparar_busqueda()
         
         while True:
             self.mostrar_menu()
@@ -268,8 +736,9 @@ class AplicacionContactos:
                     print("Opción inválida. Por favor seleccione una opción del 1 al 6.")
                 
                 # Pausa para que el usuario pueda leer el resultado
-                input("\nPresione Enter para continuar...")
-                
+                if self.pausar:
+                    input("\nPresione Enter para continuar...")
+            
             except KeyboardInterrupt:
                 print("\n\n¡Gracias por usar la Gestión de Contactos!")
                 break
@@ -277,13 +746,53 @@ class AplicacionContactos:
                 print(f"Error inesperado: {e}")
 
 
+def escribir_contactos(filas: Iterable[Tuple[str, str, str]], salida: TextIO, formato: str = 'texto',
+                       desde: int = 1) -> int:
+    """Escribe filas (nombre, email, teléfono) en ``salida`` como texto, CSV o JSON en líneas.
+    
+    Las filas se consumen a medida que llegan y se escriben de a
+    FILAS_POR_ESCRITURA, así que la memoria no depende de la cantidad y una
+    terminal o tubería recibe pocas escrituras grandes. En formato texto se
+    numeran desde ``desde``, como en listar_contactos. Devuelve la cantidad
+    de filas escritas.
+    """
+    filas = iter(filas)
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    if formato == 'csv':
+        escritor.writerow(('nombre', 'email', 'telefono'))
+    cantidad = 0
+    while True:
+        bloque = list(islice(filas, FILAS_POR_ESCRITURA))
+        if not bloque:
+            break
+        if formato == 'csv':
+            escritor.writerows(bloque)
+        elif formato == 'jsonl':
+            # Igual que json.dumps(..., ensure_ascii=False) con estas tres
+            # claves, pero sin armar un diccionario por fila.
+            buffer.write(''.join(f'{{"nombre": {encode_basestring(nombre)}, "email": {encode_basestring(email)}, '
+                                 f'"telefono": {encode_basestring(telefono)}}}\n'
+                                 for nombre, email, telefono in bloque))
+        else:
+            buffer.write(''.join(f"{i}. {nombre} - {email} - {telefono}\n"
+                                 for i, (nombre, email, telefono) in enumerate(bloque, desde + cantidad)))
+        cantidad += len(bloque)
+        salida.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+    # La cabecera del CSV, si no hubo filas.
+    salida.write(buffer.getvalue())
+    return cantidad
+
+
 # Función para crear contactos de ejemplo
-def crear_contactos_ejemplo():
+def crear_contactos_ejemplo(archivo_csv: str = 'contactos.csv'):
     """Crea algunos contactos de ejemplo para probar la aplicación."""
-    gestor = GestorContactos()
+    gestor = GestorContactos(archivo_csv)
     
     # Solo crear contactos si no existen ya
-    if len(gestor.contactos) == 0:
+    if len(gestor.almacen) == 0:
         contactos_ejemplo = [
             ("Juan Pérez", "juan.perez@email.com", "+57 311 234 5678"),
             ("María García", "maria.garcia@email.com", "+57 320 987 6543"),
@@ -292,20 +801,123 @@ def crear_contactos_ejemplo():
             ("Luis Rodríguez", "luis.rodriguez@email.com", "+57 312 345 6789")
         ]
         
-        for nombre, email, telefono in contactos_ejemplo:
-            gestor.agregar_contacto(nombre, email, telefono)
+        resultados = gestor.agregar_contactos(contactos_ejemplo)
+        
+        if any(resultado.aceptada for resultado in resultados):
+            print("Se han creado contactos de ejemplo")
+
+
+def entero_no_negativo(texto: str) -> int:
+    """Tipo de argparse para límites y desplazamientos: un entero >= 0."""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un número entero: {texto!r}") from None
+    if valor < 0:
+        raise argparse.ArgumentTypeError(f"no puede ser negativo: {valor}")
+    return valor
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Gestión de contactos. Sin subcomando abre el menú interactivo.")
+    parser.add_argument('--archivo', default='contactos.csv')
+    parser.add_argument('--diario', action='store_true', help="Guardar los cambios en el diario")
+    subcomandos = parser.add_subparsers(dest='comando')
+    
+    listar = subcomandos.add_parser('listar', help="Lista los contactos")
+    buscar = subcomandos.add_parser('buscar', help="Busca contactos por nombre, email o teléfono")
+    buscar.add_argument('texto')
+    buscar.add_argument('--por', choices=('nombre', 'email', 'telefono'), default='nombre')
+    for sub, limite in ((listar, None), (buscar, 10)):
+        sub.add_argument('--limite', '--limit', type=entero_no_negativo, default=limite)
+        sub.add_argument('--desplazamiento', '--offset', type=entero_no_negativo, default=0)
+        sub.add_argument('--formato', choices=FORMATOS, default='texto')
+    
+    agregar = subcomandos.add_parser('agregar', help="Agrega un contacto")
+    agregar.add_argument('nombre')
+    agregar.add_argument('email')
+    agregar.add_argument('telefono')
+    
+    importar = subcomandos.add_parser('importar', help="Importa un CSV con nombre, email y telefono")
+    importar.add_argument('ruta')
+    importar.add_argument('--actualizar', action='store_true', help="Sobrescribir los nombres existentes")
+    importar.add_argument('--procesos', type=int)
+    return parser
+
+
+def ejecutar_comando(args: argparse.Namespace, salida: TextIO) -> int:
+    """Ejecuta un subcomando y devuelve el código de salida.
+    
+    Los datos van a ``salida``; los mensajes del gestor se desvían a la
+    salida de errores para no mezclarse con un CSV o JSON redirigido.
+    ``listar`` lee el archivo a medida que escribe, sin cargarlo, y los demás
+    comandos abren el CSV en modo perezoso, que solo indexa desplazamientos.
+    """
+    with redirect_stdout(sys.stderr):
+        if args.comando == 'listar':
+            almacen = AlmacenCSV(args.archivo, args.diario)
+            fin = None if args.limite is None else args.desplazamiento + args.limite
+            filas = islice(almacen.recorrer_en_disco(), args.desplazamiento, fin)
+            escribir_contactos(filas, salida, args.formato, args.desplazamiento + 1)
+            almacen.cerrar()
+            return 0
+        
+        if args.comando == 'agregar':
+            if not validar_email(args.email.strip()):
+                print("Ingrese un email válido")
+                return 1
+            if not validar_telefono(args.telefono.strip()):
+                print("Ingrese un teléfono válido (solo números, espacios, guiones y paréntesis)")
+                return 1
         
-        print("Se han creado contactos de ejemplo")
+        gestor = GestorContactos(args.archivo, usar_diario=args.diario, perezoso=True)
+        try:
+            if args.comando == 'agregar':
+                agregado = gestor.agregar_contacto(args.nombre.strip(), args.email.strip(), args.telefono.strip())
+                return 0 if agregado else 1
+            if args.comando == 'importar':
+                resultados = gestor.importar_csv(args.ruta, args.actualizar, args.procesos)
+                return 0 if resultados else 1
+            
+            fin = args.desplazamiento + args.limite
+            if args.por == 'email':
+                encontrados = gestor.buscar_por_email(args.texto)
+            elif args.por == 'telefono':
+                encontrados = gestor.buscar_por_telefono(args.texto)
+            else:
+                exacto = gestor.buscar_contacto_por_nombre(args.texto)
+                encontrados = [exacto] if exacto is not None else gestor.buscar_contactos(args.texto, fin)
+            campos = [(contacto.nombre, contacto.email, contacto.telefono)
+                      for contacto in encontrados[args.desplazamiento:fin]]
+            escribir_contactos(campos, salida, args.formato, args.desplazamiento + 1)
+            return 0 if encontrados else 1
+        finally:
+            gestor.cerrar()
 
 
 # Función principal
-def main():
+def main(argv: Optional[List[str]] = None):
     """Función principal del programa."""
+    args = crear_parser().parse_args(argv)
+    if args.comando is not None:
+        try:
+            codigo = ejecutar_comando(args, sys.stdout)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            # Quien leía la salida (por ejemplo ``head``) se fue: se descarta
+            # el resto sin mostrar un error al cerrar.
+            nulo = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(nulo, sys.stdout.fileno())
+            codigo = 1
+        sys.exit(codigo)
+    
     # Crear contactos de ejemplo si no existen
-    crear_contactos_ejemplo()
+    crear_contactos_ejemplo(args.archivo)
     
-    # Iniciar la aplicación
-    app = AplicacionContactos()
+    # Iniciar la aplicación; sin terminal no se pausa entre acciones.
+    app = AplicacionContactos(GestorContactos(args.archivo, usar_diario=args.diario),
+                              pausar=sys.stdin.isatty())
     app.ejecutar()
 
 
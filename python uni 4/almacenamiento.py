@@ -0,0 +1,1163 @@
+import csv
+import gc
+import io
+import mmap
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from contacto import Contacto, clave_nombre
+from instantanea import escribir_instantanea, leer_instantanea, resumen_archivo, verificar_instantanea
+from metricas import Metricas
+from normalizacion import normalizar_email, normalizar_telefono
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class ConflictoConcurrencia(Exception):
+    """Otro proceso modificó el archivo desde la última lectura."""
+
+
+class ErrorGuardado(Exception):
+    """No se pudieron guardar los cambios en el almacenamiento."""
+
+
+class AlmacenColumnar:
+    """Guarda los contactos en listas paralelas, una por campo.
+    
+    Cada contacto es un número de fila; las filas eliminadas se reutilizan.
+    """
+    
+    __slots__ = ('nombres', 'emails', 'telefonos', '_libres')
+    
+    def __init__(self):
+        self.nombres: List[Optional[str]] = []
+        self.emails: List[Optional[str]] = []
+        self.telefonos: List[Optional[str]] = []
+        self._libres: List[int] = []
+    
+    @classmethod
+    def desde_columnas(cls, nombres: List[str], emails: List[str], telefonos: List[str]) -> 'AlmacenColumnar':
+        """Crea un almacén con esas columnas ya armadas (la fila i es el contacto i)."""
+        almacen = cls()
+        almacen.nombres = nombres
+        almacen.emails = list(map(sys.intern, emails))
+        almacen.telefonos = list(map(sys.intern, telefonos))
+        return almacen
+    
+    def agregar(self, nombre: str, email: str, telefono: str) -> int:
+        """Guarda un contacto y devuelve su número de fila."""
+        if self._libres:
+            fila = self._libres.pop()
+            self.escribir(fila, nombre, email, telefono)
+            return fila
+        # Emails y teléfonos se repiten a menudo (dominios, centralitas,
+        # valores por defecto); internarlos evita guardar copias iguales.
+        self.nombres.append(nombre)
+        self.emails.append(sys.intern(email))
+        self.telefonos.append(sys.intern(telefono))
+        return len(self.nombres) - 1
+    
+    def escribir(self, fila: int, nombre: str, email: str, telefono: str):
+        """Sobrescribe los campos de una fila."""
+        self.nombres[fila] = nombre
+        self.emails[fila] = sys.intern(email)
+        self.telefonos[fila] = sys.intern(telefono)
+    
+    def liberar(self, fila: int):
+        """Marca una fila como libre para reutilizarla."""
+        self.nombres[fila] = self.emails[fila] = self.telefonos[fila] = None
+        self._libres.append(fila)
+    
+    def campos(self, fila: int) -> Tuple[str, str, str]:
+        """Devuelve (nombre, email, teléfono) de una fila."""
+        return self.nombres[fila], self.emails[fila], self.telefonos[fila]
+    
+    def vista(self, fila: int) -> 'ContactoVista':
+        """Devuelve un contacto que lee y escribe directamente en la fila."""
+        return ContactoVista(self, fila)
+
+
+class ContactoVista(Contacto):
+    """Contacto respaldado por una fila de un AlmacenColumnar.
+    
+    Se comporta como un Contacto normal; los cambios en sus atributos se
+    escriben en el almacén.
+    """
+    
+    __slots__ = ('_almacen', '_fila')
+    
+    def __init__(self, almacen: AlmacenColumnar, fila: int):
+        self._almacen = almacen
+        self._fila = fila
+    
+    @property
+    def nombre(self) -> str:
+        return self._almacen.nombres[self._fila]
+    
+    @nombre.setter
+    def nombre(self, valor: str):
+        self._almacen.nombres[self._fila] = valor
+    
+    @property
+    def email(self) -> str:
+        return self._almacen.emails[self._fila]
+    
+    @email.setter
+    def email(self, valor: str):
+        self._almacen.emails[self._fila] = sys.intern(valor)
+    
+    @property
+    def telefono(self) -> str:
+        return self._almacen.telefonos[self._fila]
+    
+    @telefono.setter
+    def telefono(self, valor: str):
+        self._almacen.telefonos[self._fila] = sys.intern(valor)
+
+
+class AlmacenContactos:
+    """Interfaz común de los almacenes de contactos.
+    
+    Los contactos se identifican por la clave de su nombre (clave_nombre).
+    Los cambios se aplican con upsert y eliminar, y se hacen permanentes al
+    llamar a confirmar con la lista de cambios registrados desde la última
+    confirmación: tuplas ('U', nombre, email, telefono) o ('D', nombre).
+    
+    Si el gestor usa métricas, las asigna en ``metricas`` y el almacén suma
+    ahí los bytes y filas que lee y escribe.
+    
+    ``generacion`` aumenta cada vez que el almacén descarta lo que tenía en
+    memoria y vuelve a cargar, también cuando lo hace por su cuenta (al
+    fusionar cambios de otro proceso, por ejemplo). Quien guarde índices
+    sobre los contactos debe reconstruirlos cuando cambia.
+    """
+    
+    metricas: Optional[Metricas] = None
+    generacion: int = 0
+    
+    def _sumar(self, contador: str, cantidad: int):
+        if self.metricas is not None:
+            self.metricas.sumar(contador, cantidad)
+    
+    def cargar(self):
+        """Lee (o abre) el almacenamiento y descarta el estado en memoria."""
+        raise NotImplementedError
+    
+    def obtener(self, clave: str) -> Optional[Contacto]:
+        """Devuelve el contacto con esa clave, o None."""
+        raise NotImplementedError
+    
+    def upsert(self, clave: str, contacto: Contacto):
+        """Agrega el contacto o reemplaza el que tenga la misma clave."""
+        raise NotImplementedError
+    
+    def eliminar(self, clave: str) -> Optional[Contacto]:
+        """Elimina y devuelve el contacto con esa clave, o None si no existe."""
+        raise NotImplementedError
+    
+    def iterar(self) -> Iterator[Contacto]:
+        """Recorre los contactos en orden de inserción."""
+        raise NotImplementedError
+    
+    def claves(self) -> Iterator[str]:
+        """Recorre las claves en orden de inserción."""
+        raise NotImplementedError
+    
+    def iterar_campos(self) -> Iterator[Tuple[str, str, str]]:
+        """Recorre (nombre, email, teléfono) en orden de inserción, sin crear contactos."""
+        for contacto in self.iterar():
+            yield contacto.nombre, contacto.email, contacto.telefono
+    
+    def claves_con_email(self, email: str) -> Optional[List[str]]:
+        """Claves de los contactos con ese email normalizado, usando un índice propio.
+        
+        Devuelve None si el almacén no tiene ese índice; entonces el gestor
+        usa su IndiceNormalizado en memoria.
+        """
+        return None
+    
+    def claves_con_telefono(self, telefono: str) -> Optional[List[str]]:
+        """Como claves_con_email, para el teléfono normalizado."""
+        return None
+    
+    def verificar_instantanea(self) -> Optional[bool]:
+        """Comprueba a fondo la copia binaria del almacén, si la usa.
+        
+        Devuelve None si el almacén no tiene instantánea.
+        """
+        return None
+    
+    def __len__(self) -> int:
+        raise NotImplementedError
+    
+    def __contains__(self, clave: str) -> bool:
+        return self.obtener(clave) is not None
+    
+    def confirmar(self, cambios: Sequence[Tuple[str, ...]], atomico: bool = False) -> bool:
+        """Hace permanentes los cambios aplicados desde la última confirmación.
+        
+        Con ``atomico`` deben quedar en disco todos o ninguno, aunque el
+        proceso se interrumpa a mitad. Devuelve True si se guardaron.
+        """
+        raise NotImplementedError
+    
+    def refrescar(self) -> bool:
+        """Relee el almacenamiento si otro proceso lo cambió. Devuelve True si lo releyó."""
+        return False
+    
+    def refrescar_incremental(self) -> Optional[List[Tuple[str, ...]]]:
+        """Aplica solo lo que otro proceso cambió en el almacenamiento.
+        
+        Devuelve los cambios aplicados, con la forma de los de confirmar
+        (lista vacía si no hubo), o None si hubo que releer todo.
+        """
+        return None if self.refrescar() else []
+    
+    def recorrer_en_disco(self) -> Iterator[Tuple[str, str, str]]:
+        """Recorre (nombre, email, teléfono) de lo guardado, sin depender de una carga previa.
+        
+        Por defecto carga el almacenamiento y lo recorre; AlmacenCSV lo lee
+        en orden directamente del archivo.
+        """
+        self.cargar()
+        for contacto in self.iterar():
+            yield contacto.nombre, contacto.email, contacto.telefono
+    
+    def guardar(self) -> bool:
+        """Escribe el estado completo. Devuelve True si tuvo éxito."""
+        raise NotImplementedError
+    
+    def cerrar(self):
+        """Libera los recursos abiertos."""
+
+
+class AlmacenCSV(AlmacenContactos):
+    """Almacén sobre un archivo CSV, el formato de siempre.
+    
+    Mantiene un índice clave -> contacto en memoria y reescribe el CSV
+    completo al guardar. Opciones:
+    
+    * usar_diario: los cambios se añaden como filas pequeñas a un diario
+      junto al CSV, que se compacta al superar ``limite_diario`` bytes.
+    * perezoso: el CSV se mapea en memoria y el índice guarda desplazamientos;
+      cada fila se decodifica solo al consultarla.
+    * columnar: los campos viven en listas paralelas (AlmacenColumnar) y los
+      contactos se entregan como vistas.
+    * compartido: varios procesos usan el mismo archivo. Las lecturas y
+      escrituras toman un bloqueo consultivo sobre ``<archivo>.lock`` y antes
+      de escribir se comprueba que el archivo no cambió desde la última
+      lectura. Si cambió, con ``al_conflicto='fusionar'`` se relee y se
+      vuelven a aplicar los cambios propios (gana el último en escribir cada
+      contacto); con ``'fallar'`` se lanza ConflictoConcurrencia.
+    * usar_instantanea: junto al CSV se guarda una copia binaria
+      (``<archivo>.snap``, ver instantanea.py) que se carga sin parsear el CSV
+      mientras coincidan su tamaño, fecha e inodo; si no, se lee el CSV y se
+      regenera. verificar_instantanea la compara además por contenido. No
+      se usa en modo perezoso.
+    
+    El CSV siempre se escribe en un temporal que se sincroniza a disco y
+    luego reemplaza al original, así que nadie ve un archivo a medio escribir.
+    """
+    
+    def __init__(self, archivo_csv: str = 'contactos.csv', usar_diario: bool = False,
+                 limite_diario: int = 1024 * 1024, perezoso: bool = False,
+                 columnar: bool = False, compartido: bool = False,
+                 al_conflicto: str = 'fusionar', usar_instantanea: bool = False):
+        if perezoso and columnar:
+            raise ValueError("Los modos perezoso y columnar no se pueden combinar")
+        if al_conflicto not in ('fusionar', 'fallar'):
+            raise ValueError("al_conflicto debe ser 'fusionar' o 'fallar'")
+        self.archivo_csv = archivo_csv
+        # Con el diario activo cada cambio se añade como una fila pequeña a
+        # este archivo y el CSV solo se reescribe al compactar.
+        self.usar_diario = usar_diario
+        self.archivo_diario = archivo_csv + '.diario'
+        self.limite_diario = limite_diario
+        # En modo perezoso el CSV se mapea en memoria y el índice guarda el
+        # desplazamiento de cada fila; solo se decodifica al consultarla.
+        self.perezoso = perezoso
+        self._archivo_mapa = None
+        self._mapa: Optional[mmap.mmap] = None
+        self._columnas: Tuple[int, int, int] = (0, 1, 2)
+        # En modo columnar los campos viven en listas paralelas y el índice
+        # guarda el número de fila; los contactos se entregan como vistas.
+        self._almacen: Optional[AlmacenColumnar] = AlmacenColumnar() if columnar else None
+        # Índice nombre normalizado -> contacto (o desplazamiento en modo
+        # perezoso, o fila en modo columnar). Los diccionarios conservan el
+        # orden de inserción, así que también sirve como lista ordenada.
+        self._indice: Dict[str, Union[Contacto, int]] = {}
+        # Control de concurrencia entre procesos.
+        self.compartido = compartido
+        self.al_conflicto = al_conflicto
+        self.archivo_bloqueo = archivo_csv + '.lock'
+        self._nivel_bloqueo = 0
+        # Estado del disco en la última lectura o escritura propia, y cambios
+        # propios que todavía no llegaron al CSV (para poder fusionarlos).
+        self._version: Optional[tuple] = None
+        self._cambios_locales: List[Tuple[str, ...]] = []
+        # (estado del CSV, resumen de su contenido) tomado al refrescar: solo
+        # si el comienzo del archivo sigue igual se pueden leer únicamente
+        # las filas añadidas.
+        self._huella_csv: Optional[Tuple[tuple, bytes]] = None
+        # Copia binaria del CSV para arrancar rápido.
+        self.usar_instantanea = usar_instantanea and not perezoso
+        self.archivo_instantanea = archivo_csv + '.snap'
+    
+    def __len__(self) -> int:
+        return len(self._indice)
+    
+    def __contains__(self, clave: str) -> bool:
+        return clave in self._indice
+    
+    def obtener(self, clave: str) -> Optional[Contacto]:
+        valor = self._indice.get(clave)
+        return None if valor is None else self._resolver(valor)
+    
+    def iterar(self) -> Iterator[Contacto]:
+        for valor in self._indice.values():
+            yield self._resolver(valor)
+    
+    def claves(self) -> Iterator[str]:
+        return iter(self._indice)
+    
+    def iterar_campos(self) -> Iterator[Tuple[str, str, str]]:
+        campos = self._campos
+        for valor in self._indice.values():
+            yield campos(valor)
+    
+    def _resolver(self, valor: Union[Contacto, int]) -> Contacto:
+        """Devuelve el contacto de una entrada del índice, decodificándolo si hace falta."""
+        if isinstance(valor, int):
+            if self._almacen is not None:
+                return self._almacen.vista(valor)
+            return self._leer_registro(valor)
+        return valor
+    
+    def _campos(self, valor: Union[Contacto, int]) -> Tuple[str, str, str]:
+        """Devuelve (nombre, email, teléfono) de una entrada sin crear objetos."""
+        if isinstance(valor, int):
+            if self._almacen is not None:
+                return self._almacen.campos(valor)
+            campos = self._decodificar_registro(next(self._registros(valor))[1])
+            nombre, email, telefono = self._columnas
+            return campos[nombre], campos[email], campos[telefono]
+        return valor.nombre, valor.email, valor.telefono
+    
+    def upsert(self, clave: str, contacto: Contacto):
+        """Guarda un contacto en el índice según el modo de almacenamiento."""
+        if self._almacen is None:
+            self._indice[clave] = contacto
+            return
+        if isinstance(contacto, ContactoVista) and contacto._almacen is self._almacen:
+            # Las vistas ya escriben en su fila.
+            self._indice[clave] = contacto._fila
+            return
+        fila = self._indice.get(clave)
+        if fila is None:
+            self._indice[clave] = self._almacen.agregar(contacto.nombre, contacto.email, contacto.telefono)
+        else:
+            self._almacen.escribir(fila, contacto.nombre, contacto.email, contacto.telefono)
+    
+    def eliminar(self, clave: str) -> Optional[Contacto]:
+        valor = self._indice.pop(clave, None)
+        if valor is None:
+            return None
+        if self._almacen is not None:
+            contacto = Contacto(*self._almacen.campos(valor))
+            self._almacen.liberar(valor)
+            return contacto
+        return self._resolver(valor)
+    
+    @contextmanager
+    def _bloqueo(self):
+        """Toma el bloqueo exclusivo entre procesos (solo en modo compartido).
+        
+        Es reentrante dentro del mismo almacén: una recarga durante una
+        escritura no intenta bloquear de nuevo.
+        """
+        if not self.compartido or self._nivel_bloqueo:
+            self._nivel_bloqueo += 1
+            try:
+                yield
+            finally:
+                self._nivel_bloqueo -= 1
+            return
+        
+        with open(self.archivo_bloqueo, 'a+b') as archivo:
+            if fcntl is not None:
+                fcntl.flock(archivo.fileno(), fcntl.LOCK_EX)
+            else:
+                archivo.seek(0)
+                msvcrt.locking(archivo.fileno(), msvcrt.LK_LOCK, 1)
+            self._nivel_bloqueo += 1
+            try:
+                yield
+            finally:
+                self._nivel_bloqueo -= 1
+                if fcntl is not None:
+                    fcntl.flock(archivo.fileno(), fcntl.LOCK_UN)
+                else:
+                    archivo.seek(0)
+                    msvcrt.locking(archivo.fileno(), msvcrt.LK_UNLCK, 1)
+    
+    def _version_disco(self) -> tuple:
+        """Identifica el estado en disco del CSV y del diario.
+        
+        Se compara fecha de modificación, tamaño e inodo: el reemplazo atómico
+        crea un archivo nuevo, así que el inodo cambia en cada escritura.
+        """
+        version = []
+        for ruta in (self.archivo_csv, self.archivo_diario):
+            try:
+                estado = os.stat(ruta)
+                version.append((estado.st_mtime_ns, estado.st_size, estado.st_ino))
+            except FileNotFoundError:
+                version.append(None)
+        return tuple(version)
+    
+    def refrescar(self) -> bool:
+        """Se pone al día si el CSV cambió en disco desde la última lectura o escritura."""
+        return self.refrescar_incremental() != []
+    
+    def refrescar_incremental(self) -> Optional[List[Tuple[str, ...]]]:
+        """Aplica los cambios hechos en disco por otros sin releer todo.
+        
+        Comparar fecha, tamaño e inodo de CSV y diario basta para saber si
+        algo cambió. Si el diario solo creció, se leen únicamente sus filas
+        nuevas. Con el CSV no basta el inodo: al reemplazarlo el sistema
+        puede reutilizar el del archivo anterior. Solo se leen sus filas
+        añadidas si además el resumen de los bytes que ya había coincide con
+        el tomado en el refresco anterior. Si no, se lee el estado en disco y se compara fila
+        por fila con la memoria, aplicando solo altas, cambios y bajas sin
+        recrear los contactos que siguen igual. En modo perezoso un CSV
+        reemplazado obliga a reindexar todo (los desplazamientos cambian), y
+        lo mismo si hay cambios propios sin guardar: en esos casos se recarga
+        y se devuelve None.
+        """
+        with self._bloqueo():
+            actual = self._version_disco()
+            if actual == self._version:
+                self._anotar_huella(actual[0])
+                return []
+            if self._version is None or self._cambios_locales:
+                self.cargar()
+                return None
+            
+            (csv_antes, diario_antes), (csv_ahora, diario_ahora) = self._version, actual
+            crecio_csv = self._solo_crecio(csv_antes, csv_ahora) and self._comienzo_intacto(csv_antes)
+            crecio_diario = diario_antes is None or self._solo_crecio(diario_antes, diario_ahora)
+            fin_diario = None
+            try:
+                if csv_antes == csv_ahora and crecio_diario:
+                    cambios, fin_diario = self._aplicar_cola_diario(diario_antes)
+                elif crecio_csv and diario_antes is None and diario_ahora is None:
+                    cambios = self._aplicar_cola_csv(csv_antes[1])
+                elif self.perezoso:
+                    self.cargar()
+                    return None
+                else:
+                    cambios, fin_diario = self._aplicar_diferencias()
+            except (OSError, csv.Error, UnicodeDecodeError, ValueError) as e:
+                print(f"Error al refrescar contactos: {e}")
+                self.cargar()
+                return None
+            if fin_diario is not None and diario_ahora is not None and fin_diario < diario_ahora[1]:
+                # La última fila del diario se está escribiendo todavía: la
+                # versión queda antes de ella para leerla entera la próxima vez.
+                actual = (csv_ahora, (diario_ahora[0], fin_diario, diario_ahora[2]))
+            self._version = actual
+            self._anotar_huella(csv_ahora)
+        if cambios:
+            print(f"Se aplicaron {len(cambios)} cambios hechos por otro proceso en {self.archivo_csv}")
+        return cambios
+    
+    @staticmethod
+    def _solo_crecio(antes: Optional[tuple], ahora: Optional[tuple]) -> bool:
+        """True si el archivo es el mismo (inodo) y solo puede haber crecido."""
+        return ahora is not None and antes is not None and antes[2] == ahora[2] and ahora[1] >= antes[1]
+    
+    def _anotar_huella(self, estado_csv: Optional[tuple]):
+        """Resume el CSV descrito por ``estado_csv`` si no se había hecho ya."""
+        if estado_csv is None:
+            self._huella_csv = None
+        elif self._huella_csv is None or self._huella_csv[0] != estado_csv:
+            self._huella_csv = (estado_csv, resumen_archivo(self.archivo_csv, estado_csv[1]))
+    
+    def _comienzo_intacto(self, antes: tuple) -> bool:
+        """True si los primeros bytes del CSV son los que había en el estado ``antes``."""
+        return (self._huella_csv is not None and self._huella_csv[0] == antes
+                and resumen_archivo(self.archivo_csv, antes[1]) == self._huella_csv[1])
+    
+    def _aplicar_cola_diario(self, antes: Optional[tuple]) -> Tuple[List[Tuple[str, ...]], int]:
+        """Aplica las filas añadidas al diario desde ``antes``.
+        
+        Devuelve los cambios y el desplazamiento hasta donde se leyó.
+        """
+        cambios = []
+        filas, fin = self._filas_diario(antes[1] if antes else 0)
+        for fila in filas:
+            if self._aplicar(fila):
+                cambios.append(tuple(fila))
+        return cambios, fin
+    
+    def _aplicar_cola_csv(self, desde: int) -> List[Tuple[str, ...]]:
+        """Agrega las filas añadidas al final del CSV, como haría una carga completa."""
+        cambios = []
+        for nombre, email, telefono in self._filas_csv(desde):
+            clave = clave_nombre(nombre)
+            if clave not in self._indice:
+                self.upsert(clave, Contacto(nombre, email, telefono))
+                cambios.append(('U', nombre, email, telefono))
+        return cambios
+    
+    def _aplicar_diferencias(self) -> Tuple[List[Tuple[str, ...]], int]:
+        """Lleva la memoria al estado de CSV y diario en disco cambiando solo lo distinto.
+        
+        Devuelve los cambios y el desplazamiento hasta donde se leyó el diario.
+        """
+        destino: Dict[str, Tuple[str, str, str]] = {}
+        if os.path.exists(self.archivo_csv):
+            for campos in self._filas_csv():
+                destino.setdefault(clave_nombre(campos[0]), campos)
+        filas, fin = self._filas_diario(0)
+        for fila in filas:
+            if fila[0] == 'U' and len(fila) == 4:
+                destino[clave_nombre(fila[1])] = (fila[1], fila[2], fila[3])
+            elif fila[0] == 'D':
+                destino.pop(clave_nombre(fila[1]), None)
+        
+        cambios: List[Tuple[str, ...]] = []
+        for clave in [clave for clave in self._indice if clave not in destino]:
+            cambios.append(('D', self._campos(self._indice[clave])[0]))
+            self.eliminar(clave)
+        for clave, campos in destino.items():
+            valor = self._indice.get(clave)
+            if valor is None or self._campos(valor) != campos:
+                self.upsert(clave, Contacto(*campos))
+                cambios.append(('U', *campos))
+        return cambios, fin
+    
+    def _filas_csv(self, desde: int = 0) -> Iterator[Tuple[str, str, str]]:
+        """Recorre las filas (nombre, email, teléfono) del CSV desde un desplazamiento en bytes."""
+        with open(self.archivo_csv, 'rb') as archivo:
+            cabecera = next(csv.reader([archivo.readline().decode('utf-8-sig')]), [])
+            if not cabecera:
+                return
+            columnas = [cabecera.index(campo) for campo in ('nombre', 'email', 'telefono')]
+            if desde > archivo.tell():
+                archivo.seek(desde)
+            for fila in csv.reader(io.TextIOWrapper(archivo, encoding='utf-8', newline='')):
+                if fila:
+                    yield fila[columnas[0]], fila[columnas[1]], fila[columnas[2]]
+    
+    def recorrer_en_disco(self) -> Iterator[Tuple[str, str, str]]:
+        """Recorre los contactos del CSV sin cargarlos en memoria.
+        
+        Las filas se leen a medida que se piden, así que mostrar las primeras
+        cuesta lo mismo con cualquier tamaño de archivo. Como al cargar, de
+        los nombres repetidos queda el primero. Si hay un diario pendiente el
+        CSV no está al día, y entonces se carga completo.
+        """
+        if os.path.exists(self.archivo_diario):
+            self.cargar()
+            yield from self.iterar_campos()
+            return
+        if not os.path.exists(self.archivo_csv):
+            return
+        vistos = set()
+        for fila in self._filas_csv():
+            clave = clave_nombre(fila[0])
+            if clave not in vistos:
+                vistos.add(clave)
+                yield fila
+    
+    def cargar(self):
+        """Carga los contactos desde el archivo CSV."""
+        with self._bloqueo():
+            self._cargar()
+            self._version = self._version_disco()
+        self._cambios_locales = []
+    
+    def _cargar(self):
+        # La versión se toma antes de leer: si al compactar un diario
+        # pendiente se guarda, no debe verse como un cambio ajeno.
+        self._version = self._version_disco()
+        self.generacion += 1
+        self._indice = {}
+        if self._almacen is not None:
+            self._almacen = AlmacenColumnar()
+        self._cerrar_mapa()
+        if os.path.exists(self.archivo_csv):
+            try:
+                if self.perezoso:
+                    duplicados = self._indexar_archivo()
+                elif self.usar_instantanea:
+                    duplicados = self._leer_con_instantanea()
+                else:
+                    duplicados = self._leer_archivo()
+                self._sumar('filas_leidas', len(self._indice) + duplicados)
+                print(f"Se cargaron {len(self._indice)} contactos desde {self.archivo_csv}")
+                if duplicados:
+                    print(f"Se ignoraron {duplicados} filas con nombres repetidos")
+            except Exception as e:
+                print(f"Error al cargar contactos: {e}")
+                self._indice = {}
+        else:
+            print(f"Archivo {self.archivo_csv} no encontrado. Se creará uno nuevo.")
+        
+        if os.path.exists(self.archivo_diario):
+            self._reproducir_diario()
+            # Sin modo diario no debe quedar un diario pendiente.
+            if not self.usar_diario:
+                self.compactar_diario()
+    
+    def _leer_con_instantanea(self) -> int:
+        """Carga desde la instantánea si está al día; si no, del CSV, y la regenera."""
+        columnas = leer_instantanea(self.archivo_instantanea, self.archivo_csv)
+        cargada = columnas is not None and self._cargar_columnas(*columnas)
+        if self.metricas is not None:
+            self.metricas.acierto('instantanea', cargada)
+        if cargada:
+            self._sumar('bytes_leidos', os.path.getsize(self.archivo_instantanea))
+            return 0
+        
+        estado = os.stat(self.archivo_csv)
+        duplicados = self._leer_archivo()
+        resumen = resumen_archivo(self.archivo_csv)
+        self._sumar('bytes_leidos', estado.st_size)
+        # Si el CSV cambió mientras se leía, la instantánea no sería fiel.
+        actual = os.stat(self.archivo_csv)
+        if (actual.st_size, actual.st_mtime_ns, actual.st_ino) == (estado.st_size, estado.st_mtime_ns, estado.st_ino):
+            self._guardar_instantanea(estado, resumen)
+        return duplicados
+    
+    def _guardar_instantanea(self, estado: os.stat_result, resumen: bytes):
+        """Guarda la instantánea del CSV descrito por ``estado`` y ``resumen``."""
+        try:
+            filas = ((clave, *self._campos(valor)) for clave, valor in self._indice.items())
+            escribir_instantanea(self.archivo_instantanea, filas, estado, resumen)
+        except (OSError, ValueError) as e:
+            print(f"No se pudo guardar la instantánea: {e}")
+    
+    def _cargar_columnas(self, claves: List[str], nombres: List[str], emails: List[str],
+                         telefonos: List[str]) -> bool:
+        """Arma el índice a partir de columnas de campos, sin un bucle de Python por fila.
+        
+        La instantánea se escribe desde el índice, así que no trae claves
+        repetidas; si las trae no es de este almacén y devuelve False sin
+        cargar nada.
+        """
+        # Como en IndiceBusqueda.agregar_muchos: los contactos nuevos viven
+        # tanto como el almacén y el recolector de ciclos solo los recorrería.
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            if self._almacen is None:
+                indice = dict(zip(claves, map(Contacto, nombres, emails, telefonos)))
+            else:
+                indice = dict(zip(claves, range(len(nombres))))
+        finally:
+            if recolector_activo:
+                gc.enable()
+        if len(indice) != len(nombres):
+            return False
+        self._indice = indice
+        if self._almacen is not None:
+            self._almacen = AlmacenColumnar.desde_columnas(nombres, emails, telefonos)
+        return True
+    
+    def verificar_instantanea(self) -> Optional[bool]:
+        """Compara el resumen guardado en la instantánea con el del CSV.
+        
+        Al cargar solo se comparan tamaño, fecha e inodo; esto lee el CSV
+        completo para descartar también un archivo reemplazado que los
+        conserve. Si no coincide, borra la instantánea para que la próxima
+        carga lea el CSV y la regenere.
+        """
+        if not self.usar_instantanea:
+            return None
+        with self._bloqueo():
+            if verificar_instantanea(self.archivo_instantanea, self.archivo_csv):
+                return True
+            try:
+                os.remove(self.archivo_instantanea)
+            except FileNotFoundError:
+                pass
+            return False
+    
+    def _leer_archivo(self) -> int:
+        """Carga todas las filas del CSV como contactos. Devuelve los nombres repetidos."""
+        duplicados = 0
+        with open(self.archivo_csv, 'r', newline='', encoding='utf-8') as archivo:
+            self._sumar('bytes_leidos', os.fstat(archivo.fileno()).st_size)
+            reader = csv.DictReader(archivo)
+            for fila in reader:
+                contacto = Contacto.from_dict(fila)
+                # Si el archivo trae nombres repetidos se conserva el primero,
+                # igual que hacía la búsqueda lineal.
+                clave = clave_nombre(contacto.nombre)
+                if clave in self._indice:
+                    duplicados += 1
+                else:
+                    self.upsert(clave, contacto)
+        return duplicados
+    
+    def _abrir_mapa(self):
+        """Mapea el CSV en memoria (un archivo vacío no se puede mapear)."""
+        self._archivo_mapa = open(self.archivo_csv, 'rb')
+        if os.fstat(self._archivo_mapa.fileno()).st_size > 0:
+            self._mapa = mmap.mmap(self._archivo_mapa.fileno(), 0, access=mmap.ACCESS_READ)
+    
+    def _cerrar_mapa(self):
+        """Libera el mapeo del CSV, necesario antes de reemplazar el archivo."""
+        if self._mapa is not None:
+            self._mapa.close()
+            self._mapa = None
+        if self._archivo_mapa is not None:
+            self._archivo_mapa.close()
+            self._archivo_mapa = None
+    
+    def cerrar(self):
+        self._cerrar_mapa()
+    
+    def _registros(self, posicion: int) -> Iterator[Tuple[int, bytes]]:
+        """Recorre los registros del CSV mapeado desde un desplazamiento.
+        
+        Devuelve pares (desplazamiento, bytes del registro). Un registro puede
+        ocupar varias líneas si tiene campos entre comillas con saltos de línea.
+        """
+        mapa = self._mapa
+        if mapa is None:
+            return
+        tamano = len(mapa)
+        while posicion < tamano:
+            fin = mapa.find(b'\n', posicion)
+            if fin < 0:
+                fin = tamano
+            registro = mapa[posicion:fin]
+            # Con un número impar de comillas el salto de línea está dentro
+            # de un campo y el registro continúa en la línea siguiente.
+            while registro.count(b'"') % 2 and fin < tamano:
+                siguiente = mapa.find(b'\n', fin + 1)
+                if siguiente < 0:
+                    siguiente = tamano
+                registro = mapa[posicion:siguiente]
+                fin = siguiente
+            yield posicion, registro.rstrip(b'\r')
+            posicion = fin + 1
+    
+    @staticmethod
+    def _decodificar_registro(registro: bytes) -> List[str]:
+        """Separa los campos de un registro CSV."""
+        return next(csv.reader([registro.decode('utf-8')]), [])
+    
+    def _indexar_archivo(self) -> int:
+        """Construye el índice nombre -> desplazamiento sin crear contactos.
+        
+        Devuelve la cantidad de nombres repetidos ignorados.
+        """
+        self._abrir_mapa()
+        self._sumar('bytes_leidos', len(self._mapa) if self._mapa is not None else 0)
+        registros = self._registros(0)
+        primero = next(registros, None)
+        if primero is None:
+            return 0
+        cabecera = self._decodificar_registro(primero[1])
+        self._columnas = tuple(cabecera.index(campo) for campo in ('nombre', 'email', 'telefono'))
+        columna_nombre = self._columnas[0]
+        
+        duplicados = 0
+        for inicio, registro in registros:
+            if not registro.strip():
+                continue
+            # Caso habitual: el nombre es la primera columna y no lleva
+            # comillas, así que basta con cortar hasta la primera coma.
+            if columna_nombre == 0 and not registro.startswith(b'"'):
+                fin = registro.find(b',')
+                nombre = registro[:fin if fin >= 0 else len(registro)].decode('utf-8')
+            else:
+                nombre = self._decodificar_registro(registro)[columna_nombre]
+            clave = clave_nombre(nombre)
+            if clave in self._indice:
+                duplicados += 1
+            else:
+                self._indice[clave] = inicio
+        return duplicados
+    
+    def _leer_registro(self, inicio: int) -> Contacto:
+        """Decodifica el contacto que empieza en el desplazamiento dado."""
+        _, registro = next(self._registros(inicio))
+        campos = self._decodificar_registro(registro)
+        nombre, email, telefono = self._columnas
+        return Contacto(campos[nombre], campos[email], campos[telefono])
+    
+    def _filas_diario(self, desde: int = 0) -> Tuple[List[List[str]], int]:
+        """Lee las filas del diario a partir de un desplazamiento en bytes.
+        
+        Devuelve las filas y el desplazamiento donde terminó la última fila
+        completa. Una última línea sin salto de línea, o con comillas sin
+        cerrar, es una escritura en curso (o interrumpida) y se omite; leer
+        nunca modifica el archivo. Se parsea como el CSV principal, así que
+        los campos pueden tener saltos de línea entre comillas.
+        """
+        try:
+            with open(self.archivo_diario, 'rb') as archivo:
+                archivo.seek(desde)
+                contenido = archivo.read()
+        except FileNotFoundError:
+            return [], desde
+        if contenido and not contenido.endswith(b'\n'):
+            contenido = contenido[:contenido.rfind(b'\n') + 1]
+        texto = contenido.decode('utf-8')
+        flujo = io.StringIO(texto, newline='')
+        filas: List[List[str]] = []
+        completo = 0
+        try:
+            for fila in csv.reader(flujo, strict=True):
+                completo = flujo.tell()
+                if fila:
+                    filas.append(fila)
+        except csv.Error:
+            # Comillas abiertas hasta el final: la última fila está a medias.
+            if flujo.tell() < len(texto):
+                raise
+        if completo < len(texto):
+            contenido = texto[:completo].encode('utf-8')
+        self._sumar('bytes_leidos', len(contenido))
+        return filas, desde + len(contenido)
+    
+    def _reparar_diario(self):
+        """Corta una última línea sin salto de línea, resto de una escritura interrumpida.
+        
+        Así los siguientes cambios no quedan pegados a ella. Solo debe
+        llamarse con la garantía de que nadie está escribiendo en el diario:
+        con el bloqueo tomado o desde el proceso que escribe.
+        """
+        try:
+            with open(self.archivo_diario, 'r+b') as archivo:
+                fin = archivo.seek(0, os.SEEK_END)
+                # Se busca el último salto de línea hacia atrás, por bloques
+                while fin > 0:
+                    inicio = max(0, fin - 4096)
+                    archivo.seek(inicio)
+                    bloque = archivo.read(fin - inicio)
+                    salto = bloque.rfind(b'\n')
+                    if salto >= 0:
+                        fin = inicio + salto + 1
+                        break
+                    fin = inicio
+                if fin < archivo.seek(0, os.SEEK_END):
+                    archivo.truncate(fin)
+        except FileNotFoundError:
+            pass
+    
+    def _reproducir_diario(self):
+        """Aplica sobre los contactos cargados los cambios pendientes del diario."""
+        try:
+            # Al cargar con el bloqueo tomado ningún otro proceso está a mitad
+            # de una escritura, así que se puede reparar el diario.
+            if self.compartido:
+                self._reparar_diario()
+            filas, _ = self._filas_diario()
+        except Exception as e:
+            print(f"Error al leer el diario: {e}")
+            return
+        
+        aplicados = 0
+        for fila in filas:
+            if self._aplicar(fila):
+                aplicados += 1
+        if aplicados:
+            print(f"Se aplicaron {aplicados} cambios pendientes desde {self.archivo_diario}")
+    
+    def _aplicar(self, cambio: Sequence[str]) -> bool:
+        """Aplica un cambio ('U', nombre, email, telefono) o ('D', nombre)."""
+        operacion, nombre = cambio[0], cambio[1]
+        if operacion == 'U' and len(cambio) == 4:
+            self.upsert(clave_nombre(nombre), Contacto(nombre, cambio[2], cambio[3]))
+        elif operacion == 'D':
+            self.eliminar(clave_nombre(nombre))
+        else:
+            return False
+        return True
+    
+    def confirmar(self, cambios: Sequence[Tuple[str, ...]], atomico: bool = False) -> bool:
+        """Persiste cambios: en el diario si está activo o reescribiendo el CSV.
+        
+        Añadir varias filas al diario no es atómico (una interrupción puede
+        dejar solo las primeras), así que con ``atomico`` y más de un cambio
+        se compacta: el CSV se reescribe de una vez con todo incluido.
+        
+        En modo compartido los cambios se anotan en ``_cambios_locales``
+        para que guardar pueda fusionarlos; si no se guardan se vuelven a
+        quitar, así una fusión posterior no aplica cambios que el gestor ya
+        deshizo.
+        """
+        if not self.usar_diario or (atomico and len(cambios) > 1):
+            previos = len(self._cambios_locales)
+            if self.compartido:
+                self._cambios_locales.extend(cambios)
+            guardado = False
+            try:
+                guardado = self.guardar() if not self.usar_diario else self.compactar_diario()
+            finally:
+                if not guardado:
+                    del self._cambios_locales[previos:]
+            return guardado
+        
+        with self._bloqueo():
+            try:
+                self._reparar_diario()
+            except OSError as e:
+                print(f"Error al escribir en el diario: {e}")
+                return False
+            anterior = self._version_disco()
+            try:
+                with open(self.archivo_diario, 'a', newline='', encoding='utf-8') as archivo:
+                    inicio = archivo.tell()
+                    csv.writer(archivo, lineterminator='\n').writerows(cambios)
+                    if self.compartido:
+                        archivo.flush()
+                        os.fsync(archivo.fileno())
+                    tamano = archivo.tell()
+            except Exception as e:
+                print(f"Error al escribir en el diario: {e}")
+                return False
+            self._sumar('bytes_escritos', tamano - inicio)
+            self._sumar('filas_escritas', len(cambios))
+            # Si nadie más tocó los archivos, el cambio de versión es solo el
+            # propio y no hace falta releer al refrescar.
+            if anterior == self._version:
+                self._version = self._version_disco()
+            
+            if tamano >= self.limite_diario:
+                self.compactar_diario()
+        return True
+    
+    def compactar_diario(self) -> bool:
+        """Vuelca el diario sobre el CSV y lo elimina. Devuelve True si pudo guardar."""
+        with self._bloqueo():
+            if not self.guardar():
+                return False
+            try:
+                os.remove(self.archivo_diario)
+            except FileNotFoundError:
+                pass
+            self._version = self._version_disco()
+            print(f"Diario compactado en {self.archivo_csv}")
+            return True
+    
+    def guardar(self) -> bool:
+        """Guarda todos los contactos en el archivo CSV.
+        
+        En modo compartido comprueba antes que nadie haya cambiado el archivo
+        y, si lo hizo, fusiona o lanza ConflictoConcurrencia según
+        ``al_conflicto``.
+        """
+        with self._bloqueo():
+            if self.compartido and self._version is not None and self._version_disco() != self._version:
+                if self.al_conflicto == 'fallar':
+                    raise ConflictoConcurrencia(
+                        f"{self.archivo_csv} fue modificado por otro proceso; refresque y reintente")
+                # En modo diario los cambios propios ya están en el diario y
+                # se recuperan al releer; si no, se vuelven a aplicar.
+                propios = self._cambios_locales
+                self._cargar()
+                for cambio in propios:
+                    self._aplicar(cambio)
+                print(f"Se fusionaron cambios de otro proceso en {self.archivo_csv}")
+            
+            if not self._escribir():
+                return False
+            self._version = self._version_disco()
+            self._cambios_locales = []
+            return True
+    
+    def _escribir(self) -> bool:
+        """Escribe el CSV completo de forma atómica.
+        
+        Las filas se escriben directamente con csv.writer, sin construir un
+        diccionario ni (en los modos perezoso y columnar) un objeto por contacto.
+        """
+        # Se escribe en un temporal sincronizado a disco y se reemplaza el
+        # original, así un fallo a mitad de escritura no deja el CSV truncado
+        # y los lectores ven el archivo anterior o el nuevo, nunca uno mixto.
+        temporal = self.archivo_csv + '.tmp'
+        reemplazado = False
+        try:
+            with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+                if self._indice:
+                    writer = csv.writer(archivo)
+                    writer.writerow(('nombre', 'email', 'telefono'))
+                    writer.writerows(map(self._campos, self._indice.values()))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+                self._sumar('bytes_escritos', archivo.tell())
+                self._sumar('filas_escritas', len(self._indice))
+            # El mapeo del archivo anterior debe cerrarse antes de reemplazarlo.
+            self._cerrar_mapa()
+            os.replace(temporal, self.archivo_csv)
+            reemplazado = True
+            self._sincronizar_directorio()
+            if self.usar_instantanea:
+                # El CSV recién escrito es justo lo que hay en memoria.
+                self._guardar_instantanea(os.stat(self.archivo_csv), resumen_archivo(self.archivo_csv))
+            print(f"Contactos guardados exitosamente en {self.archivo_csv}")
+            return True
+        except Exception as e:
+            print(f"Error al guardar contactos: {e}")
+            return False
+        finally:
+            if self.perezoso:
+                if reemplazado:
+                    # Los desplazamientos cambian con el archivo nuevo; al
+                    # reindexar se liberan también los contactos ya decodificados.
+                    self._indice = {}
+                    self._indexar_archivo()
+                elif self._mapa is None and os.path.exists(self.archivo_csv):
+                    self._abrir_mapa()
+    
+    def _sincronizar_directorio(self):
+        """Asegura en disco el renombrado del CSV (no disponible en Windows)."""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        directorio = os.open(os.path.dirname(os.path.abspath(self.archivo_csv)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(directorio)
+        finally:
+            os.close(directorio)
+
+
+class AlmacenSQLite(AlmacenContactos):
+    """Almacén sobre una base de datos SQLite.
+    
+    Cada cambio es una sola sentencia sobre una fila y las búsquedas por
+    nombre, email y teléfono usan índices de la base (sobre la clave del
+    nombre y sobre columnas con el email y el teléfono normalizados, ver
+    normalizacion.py), así que no hace falta tener los contactos en memoria.
+    Los cambios se agrupan en la transacción abierta hasta que se confirman.
+    """
+    
+    def __init__(self, ruta: str = 'contactos.db'):
+        self.ruta = ruta
+        self._conexion: Optional[sqlite3.Connection] = None
+    
+    def cargar(self):
+        """Abre la base de datos y crea la tabla si no existe."""
+        self.cerrar()
+        self.generacion += 1
+        self._conexion = sqlite3.connect(self.ruta)
+        # WAL permite lectores concurrentes mientras otro proceso escribe.
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript("""
+            CREATE TABLE IF NOT EXISTS contactos (
+                id INTEGER PRIMARY KEY,
+                clave TEXT NOT NULL UNIQUE,
+                nombre TEXT NOT NULL,
+                email TEXT NOT NULL,
+                telefono TEXT NOT NULL,
+                email_norm TEXT NOT NULL DEFAULT '',
+                telefono_norm TEXT NOT NULL DEFAULT ''
+            );
+        """)
+        self._migrar()
+        self._conexion.executescript("""
+            DROP INDEX IF EXISTS contactos_email;
+            DROP INDEX IF EXISTS contactos_telefono;
+            CREATE INDEX IF NOT EXISTS contactos_email_norm ON contactos (email_norm);
+            CREATE INDEX IF NOT EXISTS contactos_telefono_norm ON contactos (telefono_norm);
+        """)
+        print(f"Base de datos {self.ruta} abierta con {len(self)} contactos")
+    
+    def _migrar(self):
+        """Agrega y rellena las columnas normalizadas en bases creadas sin ellas."""
+        columnas = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(contactos)")}
+        if 'email_norm' in columnas:
+            return
+        with self._conexion:
+            self._conexion.execute("ALTER TABLE contactos ADD COLUMN email_norm TEXT NOT NULL DEFAULT ''")
+            self._conexion.execute("ALTER TABLE contactos ADD COLUMN telefono_norm TEXT NOT NULL DEFAULT ''")
+            filas = self._conexion.execute("SELECT id, email, telefono FROM contactos").fetchall()
+            self._conexion.executemany(
+                "UPDATE contactos SET email_norm = ?, telefono_norm = ? WHERE id = ?",
+                ((normalizar_email(email), normalizar_telefono(telefono), id_fila)
+                 for id_fila, email, telefono in filas))
+    
+    def __len__(self) -> int:
+        return self._conexion.execute("SELECT COUNT(*) FROM contactos").fetchone()[0]
+    
+    def obtener(self, clave: str) -> Optional[Contacto]:
+        fila = self._conexion.execute(
+            "SELECT nombre, email, telefono FROM contactos WHERE clave = ?", (clave,)).fetchone()
+        return None if fila is None else Contacto(*fila)
+    
+    def upsert(self, clave: str, contacto: Contacto):
+        self._conexion.execute(
+            "INSERT INTO contactos (clave, nombre, email, telefono, email_norm, telefono_norm) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (clave) DO UPDATE SET nombre = excluded.nombre, "
+            "email = excluded.email, telefono = excluded.telefono, "
+            "email_norm = excluded.email_norm, telefono_norm = excluded.telefono_norm",
+            (clave, contacto.nombre, contacto.email, contacto.telefono,
+             normalizar_email(contacto.email), normalizar_telefono(contacto.telefono)))
+    
+    def eliminar(self, clave: str) -> Optional[Contacto]:
+        contacto = self.obtener(clave)
+        if contacto is not None:
+            self._conexion.execute("DELETE FROM contactos WHERE clave = ?", (clave,))
+        return contacto
+    
+    def iterar(self) -> Iterator[Contacto]:
+        # El cursor entrega las filas a medida que se recorren.
+        for fila in self._conexion.execute("SELECT nombre, email, telefono FROM contactos ORDER BY id"):
+            yield Contacto(*fila)
+    
+    def claves(self) -> Iterator[str]:
+        for (clave,) in self._conexion.execute("SELECT clave FROM contactos ORDER BY id"):
+            yield clave
+    
+    def iterar_campos(self) -> Iterator[Tuple[str, str, str]]:
+        return iter(self._conexion.execute("SELECT nombre, email, telefono FROM contactos ORDER BY id"))
+    
+    def claves_con_email(self, email: str) -> Optional[List[str]]:
+        valor = normalizar_email(email)
+        if not valor:
+            return []
+        return [clave for (clave,) in self._conexion.execute(
+            "SELECT clave FROM contactos WHERE email_norm = ? ORDER BY id", (valor,))]
+    
+    def claves_con_telefono(self, telefono: str) -> Optional[List[str]]:
+        valor = normalizar_telefono(telefono)
+        if not valor:
+            return []
+        return [clave for (clave,) in self._conexion.execute(
+            "SELECT clave FROM contactos WHERE telefono_norm = ? ORDER BY id", (valor,))]
+    
+    def confirmar(self, cambios: Sequence[Tuple[str, ...]], atomico: bool = False) -> bool:
+        # Las sentencias ya se ejecutaron; solo falta cerrar la transacción,
+        # que siempre es atómica.
+        self._conexion.commit()
+        self._sumar('filas_escritas', len(cambios))
+        return True
+    
+    def guardar(self) -> bool:
+        try:
+            self._conexion.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"Error al guardar contactos: {e}")
+            return False
+    
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.commit()
+            self._conexion.close()
+            self._conexion = None
@@ -0,0 +1,225 @@
+"""Banco de pruebas de GestorContactos con CSV sintéticos de distintos tamaños.
+
+Para cada tamaño genera un CSV con la forma de contactos.csv y mide carga,
+guardado, búsqueda por nombre, alta, edición, baja, listado y validación.
+Informa operaciones por segundo, percentiles de latencia y memoria máxima,
+y guarda todo en JSON para comparar corridas::
+    
+    python benchmark.py --tamanos 10000 100000 1000000 --salida resultados.json
+    python benchmark.py --tamanos 100000 --usar-diario --columnar
+
+Sin diario, cada alta, edición o baja reescribe el CSV completo, así que
+con tamaños grandes conviene bajar ``--mutaciones``.
+"""
+import argparse
+import contextlib
+import csv
+import gc
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+from acividad import GestorContactos
+from validacion import validar_emails, validar_telefonos
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+NOMBRES = ["Juan", "María", "Carlos", "Ana", "Luis", "Sofía", "Jorge", "Lucía", "Pedro", "Valentina",
+           "Andrés", "Camila", "Diego", "Isabel", "Mateo", "Daniela"]
+APELLIDOS = ["Pérez", "García", "López", "Martínez", "Rodríguez", "Gómez", "Díaz", "Torres",
+             "Ramírez", "Vargas", "Castro", "Moreno", "Rojas", "Suárez", "Ortiz", "Herrera"]
+# Opciones de GestorContactos que se pueden activar desde la línea de comandos.
+OPCIONES_GESTOR = ('usar_diario', 'perezoso', 'columnar', 'usar_instantanea')
+
+
+def generar_csv(ruta: str, cantidad: int, semilla: int = 0) -> List[str]:
+    """Escribe un CSV de ``cantidad`` contactos únicos y devuelve sus nombres."""
+    azar = random.Random(semilla)
+    nombres = []
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        writer = csv.writer(archivo)
+        writer.writerow(('nombre', 'email', 'telefono'))
+        for i in range(cantidad):
+            nombre_pila, apellido = azar.choice(NOMBRES), azar.choice(APELLIDOS)
+            # El número final hace único el nombre, como exige el gestor.
+            nombre = f"{nombre_pila} {apellido} {i}"
+            usuario = f"{nombre_pila}.{apellido}{i}".lower()
+            writer.writerow((nombre, f"{usuario}@email.com", f"555-{i:07d}"))
+            nombres.append(nombre)
+    return nombres
+
+
+def resumir(latencias: Sequence[float]) -> Dict[str, float]:
+    """Operaciones por segundo y percentiles (en milisegundos) de una serie de latencias.
+    
+    Sin latencias todas las claves están, con None, para que el informe
+    tenga siempre la misma forma.
+    """
+    if not latencias:
+        return {'operaciones': 0, **dict.fromkeys(('segundos', 'operaciones_por_segundo', 'min_ms', 'max_ms',
+                                                   'media_ms', 'p50_ms', 'p90_ms', 'p99_ms'))}
+    ordenadas = sorted(latencias)
+    total = sum(ordenadas)
+    resultado = {
+        'operaciones': len(ordenadas),
+        'segundos': total,
+        'operaciones_por_segundo': len(ordenadas) / total if total else 0.0,
+        'min_ms': ordenadas[0] * 1000,
+        'max_ms': ordenadas[-1] * 1000,
+        'media_ms': statistics.fmean(ordenadas) * 1000,
+    }
+    if len(ordenadas) >= 2:
+        cuantiles = statistics.quantiles(ordenadas, n=100, method='inclusive')
+        resultado.update(p50_ms=cuantiles[49] * 1000, p90_ms=cuantiles[89] * 1000, p99_ms=cuantiles[98] * 1000)
+    else:
+        resultado.update(p50_ms=resultado['min_ms'], p90_ms=resultado['min_ms'], p99_ms=resultado['min_ms'])
+    return resultado
+
+
+def medir_cada(funcion: Callable, argumentos: Sequence) -> Dict[str, float]:
+    """Llama a ``funcion`` con cada argumento y resume las latencias."""
+    latencias = []
+    reloj = time.perf_counter
+    for argumento in argumentos:
+        inicio = reloj()
+        funcion(*argumento)
+        latencias.append(reloj() - inicio)
+    return resumir(latencias)
+
+
+def rendimiento(segundos: float, filas: int) -> Dict[str, float]:
+    return {'segundos': segundos, 'filas': filas, 'filas_por_segundo': filas / segundos if segundos else 0.0}
+
+
+def medir_una_vez(funcion: Callable, filas: int) -> Dict[str, float]:
+    """Mide una operación que procesa ``filas`` filas de una vez."""
+    inicio = time.perf_counter()
+    funcion()
+    return rendimiento(time.perf_counter() - inicio, filas)
+
+
+def memoria_maxima_rss() -> int:
+    """Memoria residente máxima del proceso en bytes (0 si no se puede saber)."""
+    if resource is None:
+        return 0
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa en KiB y macOS en bytes.
+    return maximo if sys.platform == 'darwin' else maximo * 1024
+
+
+def correr_tamano(cantidad: int, directorio: str, opciones: Dict[str, bool], consultas: int,
+                  mutaciones: int, semilla: int) -> Dict[str, object]:
+    """Corre todas las mediciones para un tamaño y devuelve sus resultados."""
+    ruta = os.path.join(directorio, f"contactos_{cantidad}.csv")
+    nombres = generar_csv(ruta, cantidad, semilla)
+    azar = random.Random(semilla + 1)
+    resultados: Dict[str, object] = {'contactos': cantidad, 'bytes_csv': os.path.getsize(ruta)}
+    
+    # Memoria de la carga, en una pasada aparte porque tracemalloc la hace más lenta.
+    gc.collect()
+    tracemalloc.start()
+    gestor = GestorContactos(ruta, **opciones)
+    resultados['memoria_carga_bytes'] = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    gestor.cerrar()
+    del gestor
+    gc.collect()
+    
+    inicio = time.perf_counter()
+    gestor = GestorContactos(ruta, **opciones)
+    resultados['cargar'] = rendimiento(time.perf_counter() - inicio, cantidad)
+    
+    resultados['guardar'] = medir_una_vez(gestor.guardar_contactos, cantidad)
+    
+    existentes = [(azar.choice(nombres),) for _ in range(consultas)]
+    resultados['buscar_nombre'] = medir_cada(gestor.buscar_contacto_por_nombre, existentes)
+    ausentes = [(f"No existe {i}",) for i in range(consultas)]
+    resultados['buscar_nombre_ausente'] = medir_cada(gestor.buscar_contacto_por_nombre, ausentes)
+    
+    nuevos = [(f"Nuevo Contacto {i}", f"nuevo{i}@email.com", f"555-9{i:06d}") for i in range(mutaciones)]
+    resultados['agregar'] = medir_cada(gestor.agregar_contacto, nuevos)
+    ediciones = [(azar.choice(nombres), None, f"555-8{i:06d}") for i in range(mutaciones)]
+    resultados['editar'] = medir_cada(gestor.editar_contacto, ediciones)
+    bajas = [(nombre,) for nombre, _, _ in nuevos]
+    resultados['eliminar'] = medir_cada(gestor.eliminar_contacto, bajas)
+    
+    resultados['listar'] = medir_una_vez(gestor.listar_contactos, len(gestor.almacen))
+    
+    def validar_todos():
+        campos = [(contacto.email, contacto.telefono) for contacto in gestor.iterar_contactos()]
+        validar_emails([email for email, _ in campos])
+        validar_telefonos([telefono for _, telefono in campos])
+    resultados['validar'] = medir_una_vez(validar_todos, len(gestor.almacen))
+    
+    gestor.cerrar()
+    resultados['memoria_maxima_rss_bytes'] = memoria_maxima_rss()
+    return resultados
+
+
+def _ms(medicion: Dict[str, float], clave: str, decimales: int) -> str:
+    valor = medicion[clave]
+    return "-" if valor is None else f"{valor:.{decimales}f} ms"
+
+
+def guardar_informe(informe: dict, ruta: str):
+    """Escribe el informe en JSON; se llama después de cada tamaño para no perder nada."""
+    with open(ruta, 'w', encoding='utf-8') as archivo:
+        json.dump(informe, archivo, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banco de pruebas del gestor de contactos")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--consultas', type=int, default=10000, help="Búsquedas por nombre por tamaño")
+    parser.add_argument('--mutaciones', type=int, default=100, help="Altas, ediciones y bajas por tamaño")
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--salida', default='resultados_benchmark.json')
+    parser.add_argument('--directorio', help="Dónde generar los CSV (por defecto, uno temporal)")
+    for opcion in OPCIONES_GESTOR:
+        parser.add_argument('--' + opcion.replace('_', '-'), action='store_true')
+    args = parser.parse_args()
+    
+    opciones = {opcion: getattr(args, opcion) for opcion in OPCIONES_GESTOR}
+    directorio = args.directorio or tempfile.mkdtemp(prefix='benchmark_contactos_')
+    informe = {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'plataforma': platform.platform(),
+        'opciones': opciones,
+        'consultas': args.consultas,
+        'mutaciones': args.mutaciones,
+        'resultados': [],
+    }
+    try:
+        for cantidad in args.tamanos:
+            print(f"Midiendo {cantidad} contactos...", file=sys.stderr)
+            # Los mensajes del gestor se descartan para no medir la terminal.
+            with open(os.devnull, 'w') as nulo, contextlib.redirect_stdout(nulo):
+                resultado = correr_tamano(cantidad, directorio, opciones, args.consultas, args.mutaciones,
+                                          args.semilla)
+            informe['resultados'].append(resultado)
+            guardar_informe(informe, args.salida)
+            print(f"  carga {resultado['cargar']['segundos']:.2f} s, "
+                  f"búsqueda p99 {_ms(resultado['buscar_nombre'], 'p99_ms', 4)}, "
+                  f"alta p99 {_ms(resultado['agregar'], 'p99_ms', 2)}", file=sys.stderr)
+    finally:
+        if not args.directorio:
+            shutil.rmtree(directorio, ignore_errors=True)
+    
+    guardar_informe(informe, args.salida)
+    print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
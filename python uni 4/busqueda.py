@@ -0,0 +1,281 @@
+import gc
+import heapq
+import re
+import threading
+import unicodedata
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+_PALABRA = re.compile(r'\w+')
+
+
+def plegar(texto: str) -> str:
+    """Pasa un texto a minúsculas y le quita tildes ("Pérez" -> "perez")."""
+    if texto.isascii():
+        return texto.casefold()
+    descompuesto = unicodedata.normalize('NFKD', texto.casefold())
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def trigramas(texto: str) -> Set[str]:
+    """Devuelve los trigramas de un texto ya plegado, con relleno en los bordes."""
+    relleno = f"  {texto} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _anotar(indice: Dict[str, Union[int, array]], entrada: str, numero: int):
+    # La mayoría de las entradas (nombres completos) son de un solo contacto:
+    # se guarda el número suelto y solo se pasa a un array al haber más.
+    actual = indice.get(entrada)
+    if actual is None:
+        indice[entrada] = numero
+    elif isinstance(actual, int):
+        indice[entrada] = array('i', (actual, numero))
+    else:
+        actual.append(numero)
+
+
+def _numeros(valor: Union[int, array, None]) -> Iterable[int]:
+    if valor is None:
+        return ()
+    if isinstance(valor, int):
+        return (valor,)
+    return valor
+
+
+class IndiceBusqueda:
+    """Índice de búsqueda por prefijo y aproximada sobre nombres.
+    
+    Trabaja con claves opacas (las del índice del gestor) y el nombre de cada
+    una. Internamente cada clave recibe un número y las listas de apariciones
+    son arrays de enteros de 4 bytes, no conjuntos de textos. Mantiene:
+    
+    * las entradas buscables por prefijo (el nombre completo y cada palabra)
+      en una lista ordenada sin repetidos, para recorrerla con bisect, y en
+      un diccionario entrada -> números;
+    * un índice invertido de trigramas para tolerar errores de escritura.
+    
+    Quitar una clave solo la marca como borrada; los números borrados se
+    descartan al consultar y el índice se reconstruye cuando pasan a ser la
+    mitad del total.
+    """
+    
+    # Puntuaciones de cada tipo de coincidencia; la aproximada va de 0 a 1.
+    EXACTA = 3.0
+    PREFIJO_COMPLETO = 2.0
+    PREFIJO_PALABRAS = 1.5
+    # Por debajo de esta cantidad de borrados no vale la pena reconstruir.
+    BORRADOS_MINIMOS = 1024
+    
+    def __init__(self):
+        self._numero: Dict[str, int] = {}
+        # Por número: clave, texto plegado (None si se borró) y cantidad de trigramas.
+        self._claves: List[str] = []
+        self._textos: List[Optional[str]] = []
+        self._num_trigramas = array('I')
+        self._entradas: Dict[str, Union[int, array]] = {}
+        self._ordenadas: List[str] = []
+        self._trigramas: Dict[str, Union[int, array]] = {}
+        self._borrados = 0
+    
+    def __len__(self):
+        return len(self._numero)
+    
+    def __contains__(self, clave: str):
+        return clave in self._numero
+    
+    @staticmethod
+    def _entradas_de(texto: str) -> Set[str]:
+        """Textos indexados por prefijo: el nombre completo y cada palabra."""
+        return {texto, *_PALABRA.findall(texto)}
+    
+    def _indexar(self, clave: str, texto: str, nuevas: Optional[List[str]]) -> int:
+        """Da un número a la clave y la anota; las entradas nuevas van a ``nuevas`` o se insertan ordenadas."""
+        numero = len(self._claves)
+        self._numero[clave] = numero
+        self._claves.append(clave)
+        self._textos.append(texto)
+        entradas = self._entradas
+        for entrada in self._entradas_de(texto):
+            if entrada not in entradas:
+                if nuevas is None:
+                    insort(self._ordenadas, entrada)
+                else:
+                    nuevas.append(entrada)
+            _anotar(entradas, entrada, numero)
+        propios = trigramas(texto)
+        self._num_trigramas.append(len(propios))
+        indice = self._trigramas
+        for trigrama in propios:
+            _anotar(indice, trigrama, numero)
+        return numero
+    
+    def agregar(self, clave: str, nombre: str):
+        """Indexa (o reindexa) el nombre de una clave."""
+        texto = plegar(nombre)
+        numero = self._numero.get(clave)
+        if numero is not None:
+            if self._textos[numero] == texto:
+                return
+            self.eliminar(clave)
+        self._indexar(clave, texto, None)
+    
+    def agregar_muchos(self, pares: Iterable[Tuple[str, str]]):
+        """Indexa muchos pares (clave, nombre) nuevos ordenando una sola vez."""
+        # Se crean muchos objetos que viven tanto como el índice; el
+        # recolector de ciclos solo añadiría pasadas inútiles sobre ellos.
+        recolector_activo = gc.isenabled()
+        gc.disable()
+        try:
+            nuevas: List[str] = []
+            for clave, nombre in pares:
+                if clave in self._numero:
+                    self.eliminar(clave)
+                self._indexar(clave, plegar(nombre), nuevas)
+            if nuevas:
+                self._ordenadas.extend(nuevas)
+                self._ordenadas.sort()
+        finally:
+            if recolector_activo:
+                gc.enable()
+    
+    def eliminar(self, clave: str):
+        """Quita una clave del índice si estaba."""
+        numero = self._numero.pop(clave, None)
+        if numero is None:
+            return
+        self._textos[numero] = None
+        self._borrados += 1
+        if self._borrados >= self.BORRADOS_MINIMOS and self._borrados * 2 >= len(self._claves):
+            self._reconstruir()
+    
+    def _reconstruir(self):
+        """Vuelve a indexar solo las claves vivas, liberando los números borrados."""
+        vivas = [(clave, texto) for clave, texto in zip(self._claves, self._textos) if texto is not None]
+        self.__init__()
+        self.agregar_muchos(vivas)
+    
+    def _claves_de(self, valor: Union[int, array, None], resultado: Set[str]):
+        textos, claves = self._textos, self._claves
+        for numero in _numeros(valor):
+            if textos[numero] is not None:
+                resultado.add(claves[numero])
+    
+    def con_prefijo(self, prefijo: str) -> Set[str]:
+        """Claves con el nombre completo o alguna palabra que empieza por el prefijo."""
+        resultado: Set[str] = set()
+        ordenadas = self._ordenadas
+        posicion = bisect_left(ordenadas, prefijo)
+        while posicion < len(ordenadas) and ordenadas[posicion].startswith(prefijo):
+            self._claves_de(self._entradas[ordenadas[posicion]], resultado)
+            posicion += 1
+        return resultado
+    
+    def buscar(self, consulta: str, limite: int = 10, similitud_minima: float = 0.3) -> List[Tuple[str, float]]:
+        """Devuelve hasta ``limite`` pares (clave, puntuación), mejores primero.
+        
+        Gana una coincidencia exacta, luego un prefijo del nombre completo,
+        luego nombres en los que cada palabra de la consulta es prefijo de
+        alguna palabra ("per" o "juan per" encuentran "Juan Pérez"). Si no
+        alcanza, se completan con nombres parecidos según los trigramas
+        compartidos (coeficiente de Dice).
+        """
+        texto = plegar(consulta).strip()
+        if not texto:
+            return []
+        puntuaciones: Dict[str, float] = {}
+        textos = self._textos
+        
+        def texto_de(clave: str) -> str:
+            return textos[self._numero[clave]]
+        
+        for clave in self.con_prefijo(texto):
+            if texto_de(clave) == texto:
+                puntuaciones[clave] = self.EXACTA
+            elif texto_de(clave).startswith(texto):
+                puntuaciones[clave] = self.PREFIJO_COMPLETO
+        
+        palabras = _PALABRA.findall(texto)
+        if palabras:
+            candidatas = None
+            # Se empieza por la palabra más larga, que suele dar menos claves.
+            for palabra in sorted(palabras, key=len, reverse=True):
+                claves = self.con_prefijo(palabra)
+                candidatas = claves if candidatas is None else candidatas & claves
+                if not candidatas:
+                    break
+            for clave in candidatas or ():
+                puntuaciones.setdefault(clave, self.PREFIJO_PALABRAS)
+        
+        if len(puntuaciones) < limite:
+            propios = trigramas(texto)
+            compartidos: Counter = Counter()
+            for trigrama in propios:
+                compartidos.update(_numeros(self._trigramas.get(trigrama)))
+            for numero, cantidad in compartidos.items():
+                if textos[numero] is None:
+                    continue
+                clave = self._claves[numero]
+                if clave in puntuaciones:
+                    continue
+                similitud = 2 * cantidad / (len(propios) + self._num_trigramas[numero])
+                if similitud >= similitud_minima:
+                    puntuaciones[clave] = similitud
+        
+        return heapq.nlargest(limite, puntuaciones.items(),
+                              key=lambda par: (par[1], -len(texto_de(par[0]))))
+
+
+class ConstruccionIndice:
+    """Construye un IndiceBusqueda en un hilo aparte.
+    
+    Recibe una copia de los pares (clave, nombre) y los indexa por bloques
+    mientras el hilo principal sigue atendiendo al usuario. Los cambios que
+    lleguen entretanto se anotan con ``agregar``/``eliminar`` (la misma
+    interfaz que el índice) y ``terminar`` los aplica en orden al final.
+    """
+    
+    BLOQUE = 10_000
+    
+    def __init__(self, pares: List[Tuple[str, str]]):
+        self._indice = IndiceBusqueda()
+        self._pares = pares
+        self._cambios: List[Tuple[str, Optional[str]]] = []
+        self._error: Optional[BaseException] = None
+        self._cancelada = threading.Event()
+        self._hilo = threading.Thread(target=self._construir, name='indice-busqueda', daemon=True)
+        self._hilo.start()
+    
+    def _construir(self):
+        try:
+            for inicio in range(0, len(self._pares), self.BLOQUE):
+                if self._cancelada.is_set():
+                    return
+                self._indice.agregar_muchos(self._pares[inicio:inicio + self.BLOQUE])
+        except BaseException as error:
+            self._error = error
+    
+    def agregar(self, clave: str, nombre: str):
+        self._cambios.append((clave, nombre))
+    
+    def eliminar(self, clave: str):
+        self._cambios.append((clave, None))
+    
+    def cancelar(self):
+        """Abandona la construcción; el hilo termina al acabar el bloque actual."""
+        self._cancelada.set()
+    
+    def terminar(self) -> IndiceBusqueda:
+        """Espera a que se indexe lo que falte, aplica los cambios anotados y devuelve el índice."""
+        self._hilo.join()
+        if self._error is not None:
+            raise self._error
+        for clave, nombre in self._cambios:
+            if nombre is None:
+                self._indice.eliminar(clave)
+            else:
+                self._indice.agregar(clave, nombre)
+        self._cambios.clear()
+        return self._indice
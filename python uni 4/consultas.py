@@ -0,0 +1,178 @@
+import csv
+import heapq
+import os
+import re
+from contextlib import contextmanager
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from normalizacion import normalizar_telefono
+
+CAMPOS = ('nombre', 'email', 'telefono')
+_NO_DIGITOS = re.compile(r'[^0-9]+')
+# Un paso recibe el iterador de filas de la etapa anterior y devuelve otro.
+Paso = Callable[[Iterator[tuple]], Iterator[tuple]]
+
+
+def dominio_email(email: str) -> str:
+    """Dominio de un email en minúsculas ("Ana@Gmail.com" -> "gmail.com")."""
+    return email.strip().rpartition('@')[2].casefold()
+
+
+class Consulta:
+    """Consulta perezosa sobre los contactos, armada con generadores encadenados.
+    
+    Uso::
+        
+        consulta = gestor.consultar().con_dominio('gmail.com').ordenar('nombre', limite=10)
+        for nombre, email, telefono in consulta:
+            ...
+        gestor.consultar().con_dominio('gmail.com').exportar_jsonl('gmail.jsonl')
+    
+    Cada método devuelve una consulta nueva con un paso más, así que una
+    consulta se puede reutilizar y refinar. Nada se lee hasta recorrerla, y
+    cada recorrido vuelve a leer el almacén. Las filas son tuplas con los
+    campos de ``campos`` (nombre, email y teléfono salvo que se proyecte con
+    ``seleccionar``) y pasan de un paso al siguiente de a una: solo ordenar
+    sin límite necesita tenerlas todas en memoria.
+    """
+    
+    def __init__(self, origen: Callable[[], Iterable[tuple]], campos: Sequence[str] = CAMPOS,
+                 pasos: Sequence[Paso] = ()):
+        self._origen = origen
+        self.campos = tuple(campos)
+        self._pasos = tuple(pasos)
+    
+    def _con(self, paso: Paso, campos: Optional[Sequence[str]] = None) -> 'Consulta':
+        return Consulta(self._origen, self.campos if campos is None else campos, self._pasos + (paso,))
+    
+    def _posicion(self, campo: str) -> int:
+        if campo not in self.campos:
+            raise ValueError(f"El campo '{campo}' no está en la consulta {self.campos}")
+        return self.campos.index(campo)
+    
+    def __iter__(self) -> Iterator[tuple]:
+        filas = iter(self._origen())
+        for paso in self._pasos:
+            filas = paso(filas)
+        return filas
+    
+    def filtrar(self, campo: str, predicado: Callable[[str], bool]) -> 'Consulta':
+        """Deja las filas cuyo ``campo`` cumple ``predicado``."""
+        posicion = self._posicion(campo)
+        return self._con(lambda filas: (fila for fila in filas if predicado(fila[posicion])))
+    
+    def con_nombre(self, texto: str) -> 'Consulta':
+        """Nombres que contienen ``texto``, sin distinguir mayúsculas."""
+        texto = texto.casefold()
+        return self.filtrar('nombre', lambda nombre: texto in nombre.casefold())
+    
+    def con_dominio(self, dominio: str) -> 'Consulta':
+        """Emails de ese dominio ("gmail.com" o "@gmail.com"), sin distinguir mayúsculas."""
+        dominio = dominio.strip().lstrip('@').casefold()
+        return self.filtrar('email', lambda email: dominio_email(email) == dominio)
+    
+    def con_prefijo_telefono(self, prefijo: str) -> 'Consulta':
+        """Teléfonos que empiezan por ``prefijo``, mirando solo los dígitos.
+        
+        Con '+' delante el prefijo se compara con el teléfono normalizado
+        ("+57311" encuentra "311 234 5678"); si no, con los dígitos tal como
+        están escritos ("311" encuentra "(311) 234-5678").
+        """
+        digitos = _NO_DIGITOS.sub('', prefijo)
+        if prefijo.strip().startswith('+'):
+            buscado = '+' + digitos
+            return self.filtrar('telefono', lambda telefono: normalizar_telefono(telefono).startswith(buscado))
+        return self.filtrar('telefono', lambda telefono: _NO_DIGITOS.sub('', telefono).startswith(digitos))
+    
+    def seleccionar(self, *campos: str) -> 'Consulta':
+        """Deja solo esos campos, en ese orden."""
+        posiciones = [self._posicion(campo) for campo in campos]
+        if posiciones == list(range(len(self.campos))):
+            return self
+        return self._con(lambda filas: (tuple(fila[p] for p in posiciones) for fila in filas), campos)
+    
+    def ordenar(self, campo: str, descendente: bool = False, limite: Optional[int] = None) -> 'Consulta':
+        """Ordena por ``campo`` sin distinguir mayúsculas.
+        
+        Con ``limite`` se quedan solo los primeros con un montículo de ese
+        tamaño (O(n log k) y memoria para k filas); sin él hay que juntar y
+        ordenar todas. A igual campo se respeta el orden original.
+        """
+        posicion = self._posicion(campo)
+        
+        def clave(fila: tuple) -> str:
+            return fila[posicion].casefold()
+        
+        if limite is None:
+            return self._con(lambda filas: iter(sorted(filas, key=clave, reverse=descendente)))
+        elegir = heapq.nlargest if descendente else heapq.nsmallest
+        return self._con(lambda filas: iter(elegir(limite, filas, key=clave)))
+    
+    def limitar(self, cantidad: Optional[int], desplazamiento: int = 0) -> 'Consulta':
+        """Saltea ``desplazamiento`` filas y deja a lo sumo ``cantidad`` (todas con None)."""
+        fin = None if cantidad is None else desplazamiento + cantidad
+        return self._con(lambda filas: islice(filas, desplazamiento, fin))
+    
+    def primero(self) -> Optional[tuple]:
+        return next(iter(self), None)
+    
+    def contar(self) -> int:
+        """Cantidad de filas, sin guardarlas."""
+        return sum(1 for _ in self)
+    
+    def lista(self) -> List[tuple]:
+        return list(self)
+    
+    def exportar_csv(self, ruta: str) -> int:
+        """Escribe el resultado en un CSV con cabecera. Devuelve las filas escritas.
+        
+        Las filas se escriben a medida que salen de la consulta, con memoria
+        constante. Se escribe en un temporal que reemplaza a ``ruta`` al
+        terminar, así que un error no deja un archivo a medias.
+        """
+        cantidad = 0
+        
+        def contadas(filas: Iterable[tuple]) -> Iterator[tuple]:
+            nonlocal cantidad
+            for fila in filas:
+                cantidad += 1
+                yield fila
+        
+        with _escritura_atomica(ruta) as archivo:
+            escritor = csv.writer(archivo)
+            escritor.writerow(self.campos)
+            escritor.writerows(contadas(self))
+        return cantidad
+    
+    def exportar_jsonl(self, ruta: str) -> int:
+        """Escribe el resultado como un objeto JSON por línea; como exportar_csv."""
+        claves = [encode_basestring(campo) + ': ' for campo in self.campos]
+        cantidad = 0
+        
+        def lineas() -> Iterator[str]:
+            nonlocal cantidad
+            for fila in self:
+                cantidad += 1
+                # Lo mismo que json.dumps(..., ensure_ascii=False) de un
+                # diccionario, sin crearlo.
+                yield '{' + ', '.join(clave + encode_basestring(valor) for clave, valor in zip(claves, fila)) + '}\n'
+        
+        with _escritura_atomica(ruta) as archivo:
+            archivo.writelines(lineas())
+        return cantidad
+
+
+@contextmanager
+def _escritura_atomica(ruta: str) -> Iterator[TextIO]:
+    """Abre un temporal junto a ``ruta`` y lo pone en su lugar solo si todo salió bien."""
+    temporal = ruta + '.tmp'
+    try:
+        with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+            yield archivo
+        os.replace(temporal, ruta)
+    except BaseException:
+        if os.path.exists(temporal):
+            os.remove(temporal)
+        raise
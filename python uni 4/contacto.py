@@ -0,0 +1,32 @@
+def clave_nombre(nombre: str) -> str:
+    """Normaliza un nombre para usarlo como clave de los índices y almacenes."""
+    return nombre.casefold()
+
+
+class Contacto:
+    """Clase que representa un contacto con nombre, email y teléfono."""
+    
+    # Sin __dict__ por instancia: con millones de contactos la diferencia
+    # de memoria es considerable.
+    __slots__ = ('nombre', 'email', 'telefono')
+    
+    def __init__(self, nombre: str, email: str, telefono: str):
+        self.nombre = nombre
+        self.email = email
+        self.telefono = telefono
+    
+    def __str__(self):
+        return f"{self.nombre} - {self.email} - {self.telefono}"
+    
+    def to_dict(self):
+        """Convierte el contacto a un diccionario para CSV."""
+        return {
+            'nombre': self.nombre,
+            'email': self.email,
+            'telefono': self.telefono
+        }
+    
+    @classmethod
+    def from_dict(cls, data: dict):
+        """Crea un contacto desde un diccionario de CSV."""
+        return cls(data['nombre'], data['email'], data['telefono'])
@@ -0,0 +1,118 @@
+"""Instantánea binaria de un CSV de contactos para arrancar sin parsearlo.
+
+Formato::
+    
+    cabecera   MAGIA, versión, reservado, tamaño, mtime_ns e inodo del CSV,
+               cantidad de contactos y resumen BLAKE2b del CSV (little-endian)
+    texto      clave, nombre, email y teléfono de cada contacto, en UTF-8 y
+               separados por SEPARADOR
+
+El texto se decodifica y se parte una sola vez y los campos se reparten en
+columnas sin un bucle de Python por fila; como la clave viene guardada,
+tampoco hay que normalizar los nombres. Así cargar cuesta poco más que leer
+el archivo. Al cargar, la instantánea se usa si coincide con el tamaño, la
+fecha y el inodo del CSV, que se comprueban sin leerlo; el resumen solo se
+compara a pedido, con verificar_instantanea. El CSV sigue siendo el formato
+de intercambio.
+"""
+import hashlib
+import os
+import struct
+from typing import Iterable, List, Optional, Tuple
+
+MAGIA = b'CTSN'
+VERSION = 2
+CABECERA = struct.Struct('<4sHHqqQQ32s')
+CAMPOS = 4
+# Un CSV de texto no trae caracteres nulos; si algún campo lo tuviera, no se
+# escribe la instantánea.
+SEPARADOR = '\0'
+
+
+def resumen_archivo(ruta: str, limite: Optional[int] = None) -> bytes:
+    """Calcula el resumen BLAKE2b (32 bytes) del contenido de un archivo.
+    
+    Con ``limite`` solo se resumen los primeros ``limite`` bytes.
+    """
+    resumen = hashlib.blake2b(digest_size=32)
+    with open(ruta, 'rb') as archivo:
+        while limite is None or limite > 0:
+            bloque = archivo.read(1024 * 1024 if limite is None else min(limite, 1024 * 1024))
+            if not bloque:
+                break
+            resumen.update(bloque)
+            if limite is not None:
+                limite -= len(bloque)
+    return resumen.digest()
+
+
+def escribir_instantanea(ruta: str, filas: Iterable[Tuple[str, str, str, str]],
+                         estado_csv: os.stat_result, resumen_csv: bytes):
+    """Escribe de forma atómica la instantánea de filas (clave, nombre, email, teléfono).
+    
+    Lanza ValueError si algún campo contiene SEPARADOR.
+    """
+    campos: List[str] = []
+    for fila in filas:
+        campos.extend(fila)
+    texto = SEPARADOR.join(campos)
+    if campos and texto.count(SEPARADOR) != len(campos) - 1:
+        raise ValueError("Un campo contiene el separador de la instantánea")
+    
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as archivo:
+        archivo.write(CABECERA.pack(MAGIA, VERSION, 0, estado_csv.st_size, estado_csv.st_mtime_ns,
+                                    estado_csv.st_ino, len(campos) // CAMPOS, resumen_csv))
+        archivo.write(texto.encode('utf-8'))
+    os.replace(temporal, ruta)
+
+
+def _corresponde(cabecera: tuple, estado_csv: os.stat_result) -> bool:
+    """Comprueba sin leer el CSV que la cabecera es de este formato y de ese CSV."""
+    magia, version, _, tamano, mtime, inodo = cabecera[:6]
+    return (magia == MAGIA and version == VERSION and tamano == estado_csv.st_size
+            and mtime == estado_csv.st_mtime_ns and inodo == estado_csv.st_ino)
+
+
+def leer_instantanea(ruta: str, ruta_csv: str) -> Optional[Tuple[List[str], ...]]:
+    """Devuelve las columnas (claves, nombres, emails, teléfonos) de una instantánea vigente.
+    
+    Devuelve None si no existe, está dañada o no corresponde al CSV actual
+    según su tamaño, fecha e inodo.
+    """
+    try:
+        estado = os.stat(ruta_csv)
+        with open(ruta, 'rb') as archivo:
+            datos = archivo.read()
+    except OSError:
+        return None
+    if len(datos) < CABECERA.size:
+        return None
+    cabecera = CABECERA.unpack_from(datos, 0)
+    if not _corresponde(cabecera, estado):
+        return None
+    cantidad = cabecera[6]
+    if not cantidad:
+        return tuple([] for _ in range(CAMPOS))
+    try:
+        campos = datos[CABECERA.size:].decode('utf-8').split(SEPARADOR)
+    except UnicodeDecodeError:
+        return None
+    if len(campos) != CAMPOS * cantidad:
+        return None
+    return tuple(campos[i::CAMPOS] for i in range(CAMPOS))
+
+
+def verificar_instantanea(ruta: str, ruta_csv: str) -> bool:
+    """Comprueba además con el resumen BLAKE2b que la instantánea es del CSV actual.
+    
+    Lee el CSV completo, así que no se hace al cargar: sirve para detectar
+    un CSV reemplazado conservando tamaño, fecha e inodo.
+    """
+    try:
+        estado = os.stat(ruta_csv)
+        with open(ruta, 'rb') as archivo:
+            cabecera = CABECERA.unpack(archivo.read(CABECERA.size))
+    except (OSError, struct.error):
+        return False
+    return _corresponde(cabecera, estado) and cabecera[7] == resumen_archivo(ruta_csv)
@@ -0,0 +1,170 @@
+import functools
+import json
+import math
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List
+
+# Un gancho recibe el nombre de la operación y los segundos que tardó.
+Gancho = Callable[[str, float], None]
+
+
+class Histograma:
+    """Histograma de duraciones con cubetas en potencias de 2 de microsegundos.
+    
+    Registrar cuesta una operación aritmética y un acceso a diccionario, y
+    la memoria no crece con la cantidad de mediciones. Los percentiles son
+    aproximados: se informa el límite superior de la cubeta.
+    """
+    
+    __slots__ = ('cantidad', 'total', 'minimo', 'maximo', 'cubetas')
+    
+    def __init__(self):
+        self.cantidad = 0
+        self.total = 0.0
+        self.minimo = math.inf
+        self.maximo = 0.0
+        self.cubetas: Dict[int, int] = {}
+    
+    def registrar(self, segundos: float):
+        self.cantidad += 1
+        self.total += segundos
+        if segundos < self.minimo:
+            self.minimo = segundos
+        if segundos > self.maximo:
+            self.maximo = segundos
+        # frexp da el exponente e tal que x <= 2**e: la cubeta e agrupa de
+        # 2**(e-1) a 2**e microsegundos.
+        cubeta = math.frexp(segundos * 1e6)[1] if segundos > 0 else 0
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+    
+    def percentil(self, fraccion: float) -> float:
+        """Duración aproximada (en segundos) por debajo de la cual queda ``fraccion`` de las mediciones."""
+        if not self.cantidad:
+            return 0.0
+        objetivo = fraccion * self.cantidad
+        acumulado = 0
+        for cubeta in sorted(self.cubetas):
+            acumulado += self.cubetas[cubeta]
+            if acumulado >= objetivo:
+                return min(2.0 ** cubeta / 1e6, self.maximo)
+        return self.maximo
+    
+    def resumen(self) -> Dict[str, object]:
+        return {
+            'cantidad': self.cantidad,
+            'total_s': self.total,
+            'media_s': self.total / self.cantidad if self.cantidad else 0.0,
+            'min_s': self.minimo if self.cantidad else 0.0,
+            'max_s': self.maximo,
+            'p50_s': self.percentil(0.50),
+            'p90_s': self.percentil(0.90),
+            'p99_s': self.percentil(0.99),
+            'cubetas_us': {f"<={2 ** cubeta}": n for cubeta, n in sorted(self.cubetas.items())},
+        }
+
+
+class Metricas:
+    """Registro opcional de tiempos y contadores de un gestor de contactos.
+    
+    Uso::
+        
+        metricas = Metricas()
+        gestor = GestorContactos(metricas=metricas)
+        ...
+        print(gestor.metricas())
+        metricas.volcar('metricas.json')
+    
+    Guarda un histograma por operación (cargar, guardar, buscar...), contadores
+    de bytes leídos y escritos, filas procesadas y aciertos y fallos de cada
+    índice. Los ganchos agregados con ``agregar_gancho`` se llaman al terminar
+    cada operación medida, por ejemplo para enviarla a otro sistema.
+    """
+    
+    def __init__(self):
+        self.histogramas: Dict[str, Histograma] = {}
+        self.contadores: Dict[str, int] = {}
+        self.ganchos: List[Gancho] = []
+        self.inicio = time.time()
+    
+    def agregar_gancho(self, gancho: Gancho):
+        self.ganchos.append(gancho)
+    
+    def quitar_gancho(self, gancho: Gancho):
+        self.ganchos.remove(gancho)
+    
+    @contextmanager
+    def medir(self, operacion: str):
+        """Mide la duración del bloque y la registra bajo ``operacion``."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(operacion, time.perf_counter() - inicio)
+    
+    def registrar(self, operacion: str, segundos: float):
+        histograma = self.histogramas.get(operacion)
+        if histograma is None:
+            histograma = self.histogramas[operacion] = Histograma()
+        histograma.registrar(segundos)
+        for gancho in self.ganchos:
+            gancho(operacion, segundos)
+    
+    def sumar(self, contador: str, cantidad: int = 1):
+        self.contadores[contador] = self.contadores.get(contador, 0) + cantidad
+    
+    def acierto(self, indice: str, acerto: bool):
+        """Cuenta una consulta a un índice, acertada o no."""
+        self.sumar(f"{indice}.{'aciertos' if acerto else 'fallos'}")
+    
+    def tasas_acierto(self) -> Dict[str, float]:
+        tasas = {}
+        for contador, aciertos in self.contadores.items():
+            if contador.endswith('.aciertos'):
+                indice = contador[:-len('.aciertos')]
+                total = aciertos + self.contadores.get(f"{indice}.fallos", 0)
+                tasas[indice] = aciertos / total if total else 0.0
+        for contador in self.contadores:
+            if contador.endswith('.fallos'):
+                tasas.setdefault(contador[:-len('.fallos')], 0.0)
+        return tasas
+    
+    def instantanea(self) -> Dict[str, object]:
+        """Copia de todas las métricas en tipos simples, lista para JSON."""
+        return {
+            'desde': self.inicio,
+            'segundos': time.time() - self.inicio,
+            'operaciones': {nombre: histograma.resumen() for nombre, histograma in sorted(self.histogramas.items())},
+            'contadores': dict(sorted(self.contadores.items())),
+            'tasas_acierto': self.tasas_acierto(),
+        }
+    
+    def volcar(self, ruta: str):
+        """Escribe la instantánea como JSON."""
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.instantanea(), archivo, indent=2, ensure_ascii=False)
+    
+    def reiniciar(self):
+        self.histogramas.clear()
+        self.contadores.clear()
+        self.inicio = time.time()
+
+
+def medido(operacion: str):
+    """Decorador de métodos que registra su duración en ``self._metricas``, si hay.
+    
+    Sin métricas solo agrega una llamada y una comparación por invocación.
+    """
+    def decorador(metodo):
+        @functools.wraps(metodo)
+        def envoltura(self, *args, **kwargs):
+            metricas = self._metricas
+            if metricas is None:
+                return metodo(self, *args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                return metodo(self, *args, **kwargs)
+            finally:
+                metricas.registrar(operacion, time.perf_counter() - inicio)
+        return envoltura
+    return decorador
@@ -0,0 +1,140 @@
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Código de país que se asume para los números escritos sin él.
+PAIS_POR_DEFECTO = '57'
+# Los números nacionales tienen a lo sumo esta cantidad de dígitos; uno más
+# largo escrito sin '+' se entiende que ya trae el código de país.
+DIGITOS_NACIONALES = 10
+_NO_DIGITOS = re.compile(r'[^0-9]+')
+
+
+def normalizar_email(email: str) -> str:
+    """Forma canónica de un email para compararlo: sin espacios y en minúsculas."""
+    return email.strip().casefold()
+
+
+def normalizar_telefono(telefono: str, pais: str = PAIS_POR_DEFECTO) -> str:
+    """Forma canónica, al estilo E.164, de un teléfono: '+' y solo dígitos.
+    
+    "+57 311 234 5678", "(311) 234-5678" y "0057 3112345678" dan todos
+    "+573112345678". Sin '+' ni '00' delante, un número de hasta
+    DIGITOS_NACIONALES dígitos se toma como nacional (sin el 0 de larga
+    distancia) y se le antepone ``pais``. Devuelve "" si no hay dígitos.
+    """
+    texto = telefono.strip()
+    digitos = _NO_DIGITOS.sub('', texto)
+    if not digitos:
+        return ""
+    if texto.startswith('+'):
+        return '+' + digitos
+    if digitos.startswith('00'):
+        return '+' + digitos[2:]
+    if len(digitos) <= DIGITOS_NACIONALES:
+        return '+' + pais + digitos.lstrip('0')
+    return '+' + digitos
+
+
+class IndiceNormalizado:
+    """Índices hash de emails y teléfonos normalizados.
+    
+    Como IndiceBusqueda, trabaja con claves opacas (las del gestor). Para
+    cada email y teléfono canónico guarda el conjunto de claves que lo usan,
+    así que encontrar duplicados cuesta una consulta a un diccionario.
+    """
+    
+    def __init__(self, pais: str = PAIS_POR_DEFECTO):
+        self.pais = pais
+        self._por_email: Dict[str, Set[str]] = {}
+        self._por_telefono: Dict[str, Set[str]] = {}
+        # Valores normalizados de cada clave, para poder quitarla después.
+        self._valores: Dict[str, Tuple[str, str]] = {}
+    
+    def __len__(self):
+        return len(self._valores)
+    
+    @staticmethod
+    def _anotar(indice: Dict[str, Set[str]], valor: str, clave: str):
+        if not valor:
+            return
+        claves = indice.get(valor)
+        if claves is None:
+            indice[valor] = {clave}
+        else:
+            claves.add(clave)
+    
+    @staticmethod
+    def _borrar(indice: Dict[str, Set[str]], valor: str, clave: str):
+        claves = indice.get(valor)
+        if claves is not None:
+            claves.discard(clave)
+            if not claves:
+                del indice[valor]
+    
+    def agregar(self, clave: str, email: str, telefono: str):
+        """Indexa (o reindexa) el email y el teléfono de una clave."""
+        valores = (normalizar_email(email), normalizar_telefono(telefono, self.pais))
+        anteriores = self._valores.get(clave)
+        if anteriores == valores:
+            return
+        if anteriores is not None:
+            self.eliminar(clave)
+        self._valores[clave] = valores
+        self._anotar(self._por_email, valores[0], clave)
+        self._anotar(self._por_telefono, valores[1], clave)
+    
+    def agregar_muchos(self, filas: Iterable[Tuple[str, str, str]]):
+        """Indexa muchas filas (clave, email, teléfono) de claves nuevas."""
+        anotar = self._anotar
+        for clave, email, telefono in filas:
+            valores = (normalizar_email(email), normalizar_telefono(telefono, self.pais))
+            self._valores[clave] = valores
+            anotar(self._por_email, valores[0], clave)
+            anotar(self._por_telefono, valores[1], clave)
+    
+    def eliminar(self, clave: str):
+        """Quita una clave del índice si estaba."""
+        valores = self._valores.pop(clave, None)
+        if valores is None:
+            return
+        self._borrar(self._por_email, valores[0], clave)
+        self._borrar(self._por_telefono, valores[1], clave)
+    
+    def con_email(self, email: str) -> Set[str]:
+        """Claves cuyo email coincide una vez normalizado."""
+        return set(self._por_email.get(normalizar_email(email), ()))
+    
+    def con_telefono(self, telefono: str) -> Set[str]:
+        """Claves cuyo teléfono coincide una vez normalizado."""
+        return set(self._por_telefono.get(normalizar_telefono(telefono, self.pais), ()))
+    
+    def duplicados_directos(self, orden: Iterable[str]) -> Dict[str, List[str]]:
+        """Asigna cada clave repetida a la clave conservada con la que coincide.
+        
+        Se recorren las claves en ``orden``: una clave que comparte email o
+        teléfono con otra ya conservada es duplicado de esa; si no, se
+        conserva. La coincidencia tiene que ser directa: si A comparte email
+        con B y B teléfono con C, pero A y C no comparten nada, B es
+        duplicado de A y C se conserva. Devuelve conservada -> duplicados,
+        solo para las conservadas que tienen alguno.
+        """
+        de_email: Dict[str, str] = {}
+        de_telefono: Dict[str, str] = {}
+        duplicados: Dict[str, List[str]] = {}
+        for clave in orden:
+            valores = self._valores.get(clave)
+            if valores is None:
+                continue
+            email, telefono = valores
+            # Con valores que no usa nadie más no hay nada que anotar.
+            if len(self._por_email.get(email, ())) < 2 and len(self._por_telefono.get(telefono, ())) < 2:
+                continue
+            conservada = (email and de_email.get(email)) or (telefono and de_telefono.get(telefono))
+            if conservada:
+                duplicados.setdefault(conservada, []).append(clave)
+                continue
+            if email:
+                de_email[email] = clave
+            if telefono:
+                de_telefono[telefono] = clave
+        return duplicados
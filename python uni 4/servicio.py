@@ -0,0 +1,390 @@
+"""Servicio local de contactos: JSON por líneas sobre TCP o un socket Unix.
+
+Un solo proceso mantiene un GestorContactos en memoria y atiende a muchos
+clientes a la vez. Cada petición es una línea JSON con un ``id`` opcional,
+la operación ``op`` y sus argumentos; la respuesta repite el ``id``::
+    
+    {"id": 1, "op": "agregar", "nombre": "Ana", "email": "ana@x.com", "telefono": "123"}
+    {"id": 1, "ok": true, "resultado": true, "mensaje": "Contacto 'Ana' agregado exitosamente"}
+
+Operaciones: obtener, buscar, listar, agregar, editar y eliminar. Las
+lecturas se responden en el acto. Las escrituras se aplican en memoria en
+el acto, pero se persisten en tandas: una tarea de fondo guarda cada
+``intervalo_guardado`` segundos todo lo acumulado y recién entonces responde
+a esas peticiones, así que una respuesta correcta significa que el cambio ya
+está en disco. Si el guardado falla, esas peticiones reciben un error y los
+cambios quedan pendientes hasta el próximo guardado. Como las respuestas de escritura llegan después, un cliente
+que envía varias peticiones sin esperar debe usar el ``id`` para emparejarlas.
+
+Uso::
+    
+    python servicio.py servir --puerto 8765
+    python servicio.py carga --puerto 8765 --conexiones 32 --peticiones 20000
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from acividad import GestorContactos
+from almacenamiento import ErrorGuardado
+from contacto import Contacto
+from validacion import validar_email, validar_telefono
+
+# Límite de una línea de petición.
+TAMANO_MAXIMO_LINEA = 1024 * 1024
+
+
+class ErrorPeticion(Exception):
+    """Petición mal formada o con argumentos inválidos."""
+
+
+def _como_dict(contacto: Optional[Contacto]) -> Optional[Dict[str, str]]:
+    return None if contacto is None else contacto.to_dict()
+
+
+class ServicioContactos:
+    """Atiende peticiones JSON por líneas sobre un único GestorContactos.
+    
+    Mientras corre, el gestor queda dentro de un lote abierto: los cambios
+    se acumulan y la tarea de guardado los confirma juntos con
+    ``confirmar_pendientes``. Todo se ejecuta en el bucle de eventos, sin
+    hilos, así que el gestor nunca se usa desde dos sitios a la vez.
+    """
+    
+    def __init__(self, gestor: GestorContactos, intervalo_guardado: float = 0.05):
+        self.gestor = gestor
+        self.intervalo_guardado = intervalo_guardado
+        self._operaciones: Dict[str, Callable[[Dict[str, Any]], Any]] = {
+            'obtener': self._obtener,
+            'buscar': self._buscar,
+            'listar': self._listar,
+            'agregar': self._agregar,
+            'editar': self._editar,
+            'eliminar': self._eliminar,
+        }
+        self._escrituras = {'agregar', 'editar', 'eliminar'}
+        # Futuro que se resuelve con el próximo guardado.
+        self._proximo_guardado: Optional[asyncio.Future] = None
+        self._hay_cambios: Optional[asyncio.Event] = None
+        self.peticiones_atendidas = 0
+        self.guardados = 0
+    
+    # --- Operaciones -----------------------------------------------------
+    
+    @staticmethod
+    def _texto(peticion: Dict[str, Any], campo: str, obligatorio: bool = True) -> Optional[str]:
+        valor = peticion.get(campo)
+        if valor is None and not obligatorio:
+            return None
+        if not isinstance(valor, str) or not valor.strip():
+            raise ErrorPeticion(f"Falta el campo '{campo}'")
+        return valor.strip()
+    
+    def _obtener(self, peticion: Dict[str, Any]):
+        return _como_dict(self.gestor.buscar_contacto_por_nombre(self._texto(peticion, 'nombre')))
+    
+    def _buscar(self, peticion: Dict[str, Any]):
+        limite = int(peticion.get('limite', 10))
+        contactos = self.gestor.buscar_contactos(self._texto(peticion, 'texto'), limite)
+        return [contacto.to_dict() for contacto in contactos]
+    
+    def _listar(self, peticion: Dict[str, Any]):
+        desde = int(peticion.get('desde', 0))
+        limite = int(peticion.get('limite', 100))
+        resultado = []
+        for posicion, contacto in enumerate(self.gestor.iterar_contactos()):
+            if posicion >= desde + limite:
+                break
+            if posicion >= desde:
+                resultado.append(contacto.to_dict())
+        return resultado
+    
+    def _agregar(self, peticion: Dict[str, Any]):
+        email = self._texto(peticion, 'email')
+        telefono = self._texto(peticion, 'telefono')
+        if not validar_email(email):
+            raise ErrorPeticion("Email inválido")
+        if not validar_telefono(telefono):
+            raise ErrorPeticion("Teléfono inválido")
+        return self.gestor.agregar_contacto(self._texto(peticion, 'nombre'), email, telefono)
+    
+    def _editar(self, peticion: Dict[str, Any]):
+        email = self._texto(peticion, 'email', obligatorio=False)
+        telefono = self._texto(peticion, 'telefono', obligatorio=False)
+        if email is not None and not validar_email(email):
+            raise ErrorPeticion("Email inválido")
+        if telefono is not None and not validar_telefono(telefono):
+            raise ErrorPeticion("Teléfono inválido")
+        return self.gestor.editar_contacto(self._texto(peticion, 'nombre'), email, telefono)
+    
+    def _eliminar(self, peticion: Dict[str, Any]):
+        return self.gestor.eliminar_contacto(self._texto(peticion, 'nombre'))
+    
+    # --- Protocolo ---------------------------------------------------------
+    
+    def _ejecutar(self, peticion: Dict[str, Any]) -> Dict[str, Any]:
+        """Ejecuta una petición y arma la respuesta, sin esperar al guardado."""
+        operacion = self._operaciones.get(peticion.get('op'))
+        if operacion is None:
+            raise ErrorPeticion(f"Operación desconocida: {peticion.get('op')!r}")
+        # Los métodos del gestor informan con print; ese texto viaja en la
+        # respuesta en vez de ensuciar la salida del servidor.
+        salida = io.StringIO()
+        with contextlib.redirect_stdout(salida):
+            resultado = operacion(peticion)
+        respuesta = {'ok': True, 'resultado': resultado}
+        mensaje = salida.getvalue().strip()
+        if mensaje:
+            respuesta['mensaje'] = mensaje
+        return respuesta
+    
+    async def _responder(self, peticion: Any) -> Dict[str, Any]:
+        if not isinstance(peticion, dict):
+            return {'ok': False, 'error': "La petición debe ser un objeto JSON"}
+        try:
+            respuesta = self._ejecutar(peticion)
+            if peticion['op'] in self._escrituras and respuesta['resultado']:
+                await self._esperar_guardado()
+        except (ErrorPeticion, ErrorGuardado, ValueError, TypeError) as e:
+            respuesta = {'ok': False, 'error': str(e)}
+        except Exception as e:
+            respuesta = {'ok': False, 'error': f"Error inesperado: {e}"}
+        if 'id' in peticion:
+            respuesta['id'] = peticion['id']
+        return respuesta
+    
+    async def _atender(self, lector: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Atiende una conexión hasta que el cliente la cierre."""
+        pendientes = set()
+        
+        def escribir(respuesta: Dict[str, Any]):
+            escritor.write(json.dumps(respuesta, ensure_ascii=False).encode('utf-8') + b'\n')
+        
+        async def responder_escritura(peticion: Dict[str, Any]):
+            escribir(await self._responder(peticion))
+        
+        try:
+            while True:
+                try:
+                    linea = await lector.readline()
+                except (ValueError, ConnectionError):
+                    break
+                if not linea:
+                    break
+                if not linea.strip():
+                    continue
+                self.peticiones_atendidas += 1
+                try:
+                    peticion = json.loads(linea)
+                except ValueError:
+                    escribir({'ok': False, 'error': "JSON inválido"})
+                    continue
+                if isinstance(peticion, dict) and peticion.get('op') in self._escrituras:
+                    # Las escrituras esperan al guardado en su propia tarea
+                    # para no frenar las lecturas que vienen detrás.
+                    tarea = asyncio.ensure_future(responder_escritura(peticion))
+                    pendientes.add(tarea)
+                    tarea.add_done_callback(pendientes.discard)
+                else:
+                    escribir(await self._responder(peticion))
+                await escritor.drain()
+            if pendientes:
+                await asyncio.gather(*pendientes, return_exceptions=True)
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+    
+    # --- Guardado en tandas --------------------------------------------------
+    
+    def _esperar_guardado(self) -> asyncio.Future:
+        """Devuelve un futuro que se resuelve cuando se guarde lo acumulado."""
+        if self._proximo_guardado is None:
+            self._proximo_guardado = asyncio.get_running_loop().create_future()
+        self._hay_cambios.set()
+        return self._proximo_guardado
+    
+    def _guardar(self):
+        """Confirma los cambios acumulados y avisa a quienes los esperaban."""
+        futuro, self._proximo_guardado = self._proximo_guardado, None
+        # confirmar_pendientes informa con print; no hace falta repetirlo en
+        # cada tanda, salvo si algo falló.
+        salida = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(salida):
+                self.gestor.confirmar_pendientes()
+            self.guardados += 1
+        except Exception as e:
+            detalle = salida.getvalue().strip()
+            if detalle:
+                print(detalle)
+            print(f"Error al guardar los contactos: {e}")
+            if futuro is not None and not futuro.done():
+                if not isinstance(e, ErrorGuardado):
+                    e = ErrorGuardado(f"Error al guardar los contactos: {e}")
+                futuro.set_exception(e)
+            return
+        if futuro is not None and not futuro.done():
+            futuro.set_result(None)
+    
+    async def _guardar_en_tandas(self):
+        while True:
+            await self._hay_cambios.wait()
+            # Se espera un poco para juntar las escrituras que lleguen mientras.
+            await asyncio.sleep(self.intervalo_guardado)
+            self._hay_cambios.clear()
+            self._guardar()
+    
+    # --- Ciclo de vida -------------------------------------------------------
+    
+    async def servir(self, host: str = '127.0.0.1', puerto: int = 8765,
+                     ruta_socket: Optional[str] = None, listo: Optional[asyncio.Event] = None):
+        """Atiende conexiones hasta que se cancele la tarea.
+        
+        Con ``ruta_socket`` escucha en un socket Unix en lugar de TCP. Si se
+        pasa ``listo``, se activa cuando el servidor ya acepta conexiones.
+        """
+        self._hay_cambios = asyncio.Event()
+        if ruta_socket:
+            servidor = await asyncio.start_unix_server(self._atender, ruta_socket, limit=TAMANO_MAXIMO_LINEA)
+            direccion = ruta_socket
+        else:
+            servidor = await asyncio.start_server(self._atender, host, puerto, limit=TAMANO_MAXIMO_LINEA)
+            direccion = f"{host}:{puerto}"
+        
+        guardado = asyncio.ensure_future(self._guardar_en_tandas())
+        with self.gestor.lote():
+            try:
+                async with servidor:
+                    print(f"Servicio de contactos escuchando en {direccion}")
+                    if listo is not None:
+                        listo.set()
+                    await servidor.serve_forever()
+            finally:
+                guardado.cancel()
+                # Lo que quede pendiente se guarda al cerrar el lote.
+                if self._proximo_guardado is not None and not self._proximo_guardado.done():
+                    self._proximo_guardado.cancel()
+                print(f"Servicio detenido: {self.peticiones_atendidas} peticiones, "
+                      f"{self.guardados} guardados")
+
+
+# --- Cliente de prueba de carga ----------------------------------------------
+
+async def _conectar(host: str, puerto: int, ruta_socket: Optional[str]):
+    if ruta_socket:
+        return await asyncio.open_unix_connection(ruta_socket, limit=TAMANO_MAXIMO_LINEA)
+    return await asyncio.open_connection(host, puerto, limit=TAMANO_MAXIMO_LINEA)
+
+
+def _percentil(valores: List[float], fraccion: float) -> float:
+    """Percentil por el método del rango más cercano sobre valores ordenados."""
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, max(0, int(round(fraccion * len(valores))) - 1))]
+
+
+async def prueba_carga(host: str = '127.0.0.1', puerto: int = 8765, ruta_socket: Optional[str] = None,
+                       conexiones: int = 16, peticiones: int = 10000,
+                       fraccion_escrituras: float = 0.1, semilla: int = 0) -> Dict[str, float]:
+    """Lanza ``peticiones`` peticiones repartidas en ``conexiones`` clientes.
+    
+    Cada cliente manda una petición y espera la respuesta antes de la
+    siguiente. Mezcla búsquedas y consultas por nombre con altas y
+    ediciones según ``fraccion_escrituras``. Devuelve peticiones por segundo
+    y latencias (en milisegundos) p50, p99 y máxima.
+    """
+    latencias: List[float] = []
+    errores = 0
+    por_conexion = peticiones // conexiones
+    
+    async def cliente(numero: int):
+        nonlocal errores
+        azar = random.Random(semilla + numero)
+        lector, escritor = await _conectar(host, puerto, ruta_socket)
+        try:
+            for i in range(por_conexion):
+                nombre = f"Carga {numero}-{azar.randrange(max(1, i))}"
+                if azar.random() < fraccion_escrituras:
+                    if i % 2 == 0:
+                        peticion = {'op': 'agregar', 'nombre': f"Carga {numero}-{i}",
+                                    'email': f"c{numero}.{i}@carga.com", 'telefono': str(1000000 + i)}
+                    else:
+                        peticion = {'op': 'editar', 'nombre': nombre, 'telefono': str(2000000 + i)}
+                elif i % 2 == 0:
+                    peticion = {'op': 'obtener', 'nombre': nombre}
+                else:
+                    peticion = {'op': 'buscar', 'texto': nombre[:8], 'limite': 5}
+                peticion['id'] = i
+                
+                inicio = time.perf_counter()
+                escritor.write(json.dumps(peticion).encode('utf-8') + b'\n')
+                await escritor.drain()
+                respuesta = json.loads(await lector.readline())
+                latencias.append(time.perf_counter() - inicio)
+                if not respuesta.get('ok'):
+                    errores += 1
+        finally:
+            escritor.close()
+    
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(numero) for numero in range(conexiones)))
+    duracion = time.perf_counter() - inicio
+    
+    latencias.sort()
+    return {
+        'peticiones': len(latencias),
+        'errores': errores,
+        'segundos': duracion,
+        'peticiones_por_segundo': len(latencias) / duracion if duracion else 0.0,
+        'p50_ms': _percentil(latencias, 0.50) * 1000,
+        'p99_ms': _percentil(latencias, 0.99) * 1000,
+        'max_ms': (latencias[-1] if latencias else 0.0) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servicio de contactos por JSON en líneas")
+    subcomandos = parser.add_subparsers(dest='comando', required=True)
+    
+    servir = subcomandos.add_parser('servir', help="Inicia el servicio")
+    carga = subcomandos.add_parser('carga', help="Mide peticiones por segundo y latencias")
+    for sub in (servir, carga):
+        sub.add_argument('--host', default='127.0.0.1')
+        sub.add_argument('--puerto', type=int, default=8765)
+        sub.add_argument('--socket', dest='ruta_socket', help="Ruta de un socket Unix en lugar de TCP")
+    servir.add_argument('--archivo', default='contactos.csv')
+    servir.add_argument('--intervalo', type=float, default=0.05,
+                        help="Segundos que se juntan escrituras antes de guardar")
+    carga.add_argument('--conexiones', type=int, default=16)
+    carga.add_argument('--peticiones', type=int, default=10000)
+    carga.add_argument('--escrituras', type=float, default=0.1, help="Fracción de peticiones de escritura")
+    args = parser.parse_args()
+    
+    if args.comando == 'servir':
+        # Con el diario cada tanda añade unas filas en vez de reescribir el CSV.
+        gestor = GestorContactos(args.archivo, usar_diario=True)
+        servicio = ServicioContactos(gestor, args.intervalo)
+        try:
+            asyncio.run(servicio.servir(args.host, args.puerto, args.ruta_socket))
+        except KeyboardInterrupt:
+            pass
+        except ErrorGuardado as e:
+            # Al cerrar no se pudo guardar lo que quedaba pendiente
+            print(e)
+        finally:
+            gestor.cerrar()
+    else:
+        resultado = asyncio.run(prueba_carga(args.host, args.puerto, args.ruta_socket, args.conexiones,
+                                             args.peticiones, args.escrituras))
+        print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
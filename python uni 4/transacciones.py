@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from contacto import clave_nombre
+from validacion import validar_email, validar_telefono
+
+if TYPE_CHECKING:
+    from acividad import GestorContactos
+
+# Estado preparado de un contacto: sus campos, o None si se elimina.
+Campos = Optional[Tuple[str, str, str]]
+
+
+class Transaccion:
+    """Altas, ediciones y bajas que se validan juntas y se guardan de una vez.
+    
+    Uso::
+        
+        with gestor.transaccion() as t:
+            for nombre, email, _ in gestor.consultar().con_dominio('viejo.com'):
+                t.editar(nombre, nuevo_email=email.replace('@viejo.com', '@nuevo.com'))
+    
+    Las operaciones solo se anotan: el gestor no cambia hasta ``confirmar``
+    (al salir del ``with`` sin excepción), y ``deshacer`` (o una excepción)
+    las descarta. Cada operación ve el efecto de las anteriores de la misma
+    transacción. Los errores (nombre repetido, contacto inexistente, email o
+    teléfono inválido) se juntan en ``errores`` y con cualquiera de ellos
+    nada se aplica. Al confirmar, los cambios se escriben con una sola
+    escritura atómica (ver AlmacenContactos.confirmar).
+    """
+    
+    def __init__(self, gestor: 'GestorContactos'):
+        self.gestor = gestor
+        # Estado final de cada contacto tocado, en el orden en que se tocó.
+        self._estado: Dict[str, Campos] = {}
+        self.errores: List[str] = []
+        self.terminada = False
+    
+    def __enter__(self) -> 'Transaccion':
+        return self
+    
+    def __exit__(self, tipo, valor, traza):
+        if self.terminada:
+            return False
+        if tipo is None:
+            self.confirmar()
+        else:
+            self.deshacer()
+        return False
+    
+    def __len__(self) -> int:
+        return len(self._estado)
+    
+    def obtener(self, nombre: str) -> Campos:
+        """Campos (nombre, email, teléfono) de un contacto como quedarían al confirmar."""
+        clave = clave_nombre(nombre)
+        if clave in self._estado:
+            return self._estado[clave]
+        contacto = self.gestor.almacen.obtener(clave)
+        return None if contacto is None else (contacto.nombre, contacto.email, contacto.telefono)
+    
+    def _validar(self, nombre: str, email: Optional[str], telefono: Optional[str]) -> bool:
+        """Anota los errores de los campos dados; None es un campo que no cambia."""
+        errores = []
+        if not nombre or email == "" or telefono == "":
+            errores.append(f"'{nombre}': campos vacíos")
+        if email and not validar_email(email):
+            errores.append(f"'{nombre}': email inválido")
+        if telefono and not validar_telefono(telefono):
+            errores.append(f"'{nombre}': teléfono inválido")
+        self.errores.extend(errores)
+        return not errores
+    
+    def agregar(self, nombre: str, email: str, telefono: str) -> bool:
+        nombre, email, telefono = nombre.strip(), email.strip(), telefono.strip()
+        if self.obtener(nombre) is not None:
+            self.errores.append(f"Ya existe un contacto con el nombre '{nombre}'")
+            return False
+        if not self._validar(nombre, email, telefono):
+            return False
+        self._estado[clave_nombre(nombre)] = (nombre, email, telefono)
+        return True
+    
+    def editar(self, nombre: str, nuevo_email: str = None, nuevo_telefono: str = None) -> bool:
+        actual = self.obtener(nombre)
+        if actual is None:
+            self.errores.append(f"No se encontró el contacto '{nombre}'")
+            return False
+        # Como en editar_contacto, un valor vacío deja el campo como estaba.
+        nuevo_email = nuevo_email.strip() if nuevo_email and nuevo_email.strip() else None
+        nuevo_telefono = nuevo_telefono.strip() if nuevo_telefono and nuevo_telefono.strip() else None
+        if not self._validar(actual[0], nuevo_email, nuevo_telefono):
+            return False
+        self._estado[clave_nombre(nombre)] = (actual[0], nuevo_email or actual[1], nuevo_telefono or actual[2])
+        return True
+    
+    def eliminar(self, nombre: str) -> bool:
+        if self.obtener(nombre) is None:
+            self.errores.append(f"No se encontró el contacto '{nombre}'")
+            return False
+        self._estado[clave_nombre(nombre)] = None
+        return True
+    
+    def confirmar(self) -> bool:
+        """Aplica y guarda todo, o nada si hubo errores o falló la escritura."""
+        if self.terminada:
+            return False
+        self.terminada = True
+        if self.errores:
+            print(f"Transacción cancelada por {len(self.errores)} errores:")
+            for error in self.errores:
+                print(f"  {error}")
+            return False
+        if not self.gestor._aplicar_transaccion(self._estado):
+            print("No se pudo guardar la transacción; no se realizaron cambios")
+            return False
+        print(f"Transacción confirmada: {len(self._estado)} contactos modificados")
+        return True
+    
+    def deshacer(self):
+        """Descarta las operaciones anotadas."""
+        self._estado.clear()
+        self.errores.clear()
+        self.terminada = True
@@ -0,0 +1,61 @@
+import re
+from typing import List, Optional, Sequence, Tuple
+
+from normalizacion import normalizar_email, normalizar_telefono
+
+# Un '@' y, entre él y el siguiente '@' (si hay), al menos un punto.
+_EMAIL = re.compile(r'[^@]*@[^@]*\.')
+# Separadores que admite un teléfono; quitándolos solo deben quedar dígitos,
+# con un '+' opcional delante (como en "+57 311 234 5678", la forma que
+# produce normalizar_telefono).
+_SEPARADORES = str.maketrans('', '', '-() ')
+# El '+' del comienzo de cada línea, para quitarlo de una columna entera.
+_MAS_INICIAL = re.compile(r'^\+', re.MULTILINE)
+
+
+def validar_email(email: str) -> bool:
+    """Validación básica de email."""
+    return _EMAIL.match(email) is not None
+
+
+def validar_telefono(telefono: str) -> bool:
+    """Validación básica de teléfono; no cuentan los espacios de los extremos."""
+    digitos = telefono.strip().translate(_SEPARADORES)
+    if digitos.startswith('+'):
+        digitos = digitos[1:]
+    return digitos.isdecimal()
+
+
+def validar_emails(emails: Sequence[str], normalizar: bool = True) -> Tuple[List[bool], Optional[List[str]]]:
+    """Valida una columna de emails de una vez.
+    
+    Devuelve la máscara de validez (un bool por valor) y, salvo con
+    ``normalizar=False``, los emails normalizados (ver normalizacion.py), en
+    el mismo orden.
+    """
+    mascara = list(map(bool, map(_EMAIL.match, emails)))
+    return mascara, [normalizar_email(email) for email in emails] if normalizar else None
+
+
+def validar_telefonos(telefonos: Sequence[str], normalizar: bool = True) -> Tuple[List[bool], Optional[List[str]]]:
+    """Valida una columna de teléfonos de una vez; como validar_emails.
+    
+    La columna se une en un solo texto, se le quitan los separadores y el
+    '+' inicial de cada línea con una llamada para cada cosa y se mira qué
+    líneas quedan solo con dígitos. Los valores rechazados así (por espacios
+    alrededor o saltos de línea propios) se revisan de a uno con
+    validar_telefono, que aplica la misma regla.
+    """
+    mascara: List[bool] = []
+    if telefonos:
+        texto = _MAS_INICIAL.sub('', '\n'.join(telefonos).translate(_SEPARADORES))
+        lineas = texto.split('\n')
+        if len(lineas) == len(telefonos):
+            mascara = list(map(str.isdecimal, lineas))
+            if not all(mascara):
+                for i, valido in enumerate(mascara):
+                    if not valido:
+                        mascara[i] = validar_telefono(telefonos[i])
+        else:
+            mascara = list(map(validar_telefono, telefonos))
+    return mascara, [normalizar_telefono(telefono) for telefono in telefonos] if normalizar else None
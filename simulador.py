@@ -0,0 +1,211 @@
+"""Simulador Monte Carlo del juego de adivinanza.
+
+Juega millones de partidas a la vez con NumPy, para una configuración de
+rango e intentos y una estrategia de jugador, y resume la tasa de
+victorias, cuántos intentos hicieron falta y cómo se reparte la
+puntuación (con la misma fórmula que motor_juego.py)::
+    
+    python simulador.py --minimo 1 --maximo 100 --intentos 10 --partidas 1000000
+    python simulador.py --intentos 5 --estrategia binaria aleatoria sesgada --sesgo 0.2
+
+Estrategias:
+
+* binaria: siempre el medio del rango posible, como sugiere la pista.
+* aleatoria: un número al azar dentro del rango posible según las pistas.
+* ciega: un número al azar de todo el rango, sin hacer caso a las pistas.
+* sesgada: el punto a ``sesgo`` del rango posible (0.5 es la binaria;
+  menos, un jugador que tira hacia los números bajos).
+
+Sin NumPy se juega partida por partida con motor_juego, mucho más lento.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+
+from motor_juego import CORRECTO, SesionJuego, calcular_puntuacion
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional
+    np = None
+
+ESTRATEGIAS = ('binaria', 'aleatoria', 'ciega', 'sesgada')
+# Partidas que se juegan juntas; acota la memoria (unos 50 bytes por partida).
+PARTIDAS_POR_BLOQUE = 1_000_000
+
+
+def _elegir(estrategia, minimo, maximo, lo, hi, sesgo, azar):
+    # Un intento por partida activa, según la estrategia
+    if estrategia == 'binaria':
+        return (lo + hi) // 2
+    if estrategia == 'aleatoria':
+        return azar.integers(lo, hi + 1)
+    if estrategia == 'ciega':
+        return azar.integers(minimo, maximo + 1, size=len(lo))
+    return lo + np.floor((hi - lo) * sesgo).astype(np.int64)
+
+
+def _simular_bloque(minimo, maximo, intentos_maximos, estrategia, partidas, sesgo, azar):
+    """Devuelve, por partida, los intentos usados para ganar (0 si perdió)."""
+    secretos = azar.integers(minimo, maximo + 1, size=partidas)
+    lo = np.full(partidas, minimo, dtype=np.int64)
+    hi = np.full(partidas, maximo, dtype=np.int64)
+    pasos = np.zeros(partidas, dtype=np.int64)
+    # Índices de las partidas que siguen en juego; se achica en cada ronda
+    activas = np.arange(partidas)
+    
+    for ronda in range(1, intentos_maximos + 1):
+        if len(activas) == 0:
+            break
+        lo_a, hi_a, secreto_a = lo[activas], hi[activas], secretos[activas]
+        intento = _elegir(estrategia, minimo, maximo, lo_a, hi_a, sesgo, azar)
+        
+        acierto = intento == secreto_a
+        pasos[activas[acierto]] = ronda
+        bajo = intento < secreto_a
+        # Igual que la pista: el rango posible se achica con cada intento
+        lo[activas[bajo]] = np.maximum(lo_a[bajo], intento[bajo] + 1)
+        alto = intento > secreto_a
+        hi[activas[alto]] = np.minimum(hi_a[alto], intento[alto] - 1)
+        activas = activas[~acierto]
+    return pasos
+
+
+def _simular_python(minimo, maximo, intentos_maximos, estrategia, partidas, sesgo, semilla):
+    # Sin NumPy: partida por partida con el motor del juego
+    azar = random.Random(semilla)
+    for _ in range(partidas):
+        sesion = SesionJuego(minimo, maximo, intentos_maximos, azar)
+        usados = 0
+        while sesion.jugando:
+            lo, hi = sesion.min_actual, sesion.max_actual
+            if estrategia == 'binaria':
+                intento = (lo + hi) // 2
+            elif estrategia == 'aleatoria':
+                intento = azar.randint(lo, hi)
+            elif estrategia == 'ciega':
+                intento = azar.randint(minimo, maximo)
+            else:
+                intento = lo + int((hi - lo) * sesgo)
+            resultado = sesion.intentar(intento)
+            if resultado.resultado == CORRECTO:
+                usados = resultado.numero
+        yield usados
+
+
+def resumir(pasos_por_cantidad, minimo, maximo, intentos_maximos, partidas):
+    """Arma el informe a partir de cuántas partidas se ganaron con 1, 2, ... intentos.
+    
+    ``pasos_por_cantidad[k]`` es la cantidad de partidas ganadas en k
+    intentos; la posición 0 son las perdidas.
+    """
+    ganadas = partidas - pasos_por_cantidad[0]
+    # Cada cantidad de intentos da siempre la misma puntuación, así que la
+    # distribución de puntuaciones sale de la de intentos.
+    puntuaciones = {}
+    for usados, cantidad in enumerate(pasos_por_cantidad):
+        if cantidad:
+            puntos = calcular_puntuacion(minimo, maximo, intentos_maximos, usados) if usados else 0
+            puntuaciones[puntos] = puntuaciones.get(puntos, 0) + cantidad
+    total_puntos = sum(puntos * cantidad for puntos, cantidad in puntuaciones.items())
+    total_pasos = sum(usados * cantidad for usados, cantidad in enumerate(pasos_por_cantidad))
+    
+    # Percentiles sin expandir millones de valores: se recorren los acumulados
+    def percentil(distribucion, fraccion):
+        objetivo = fraccion * partidas
+        acumulado = 0
+        for valor in sorted(distribucion):
+            acumulado += distribucion[valor]
+            if acumulado >= objetivo:
+                return valor
+        return 0
+    
+    return {
+        'partidas': partidas,
+        'ganadas': ganadas,
+        'tasa_victoria': ganadas / partidas if partidas else 0.0,
+        'intentos_medios_al_ganar': total_pasos / ganadas if ganadas else 0.0,
+        'distribucion_intentos': {str(usados): cantidad for usados, cantidad in enumerate(pasos_por_cantidad)
+                                  if usados and cantidad},
+        'puntuacion_media': total_puntos / partidas if partidas else 0.0,
+        'puntuacion_p50': percentil(puntuaciones, 0.50),
+        'puntuacion_p90': percentil(puntuaciones, 0.90),
+        'puntuacion_p99': percentil(puntuaciones, 0.99),
+        'puntuacion_maxima': max(puntuaciones) if puntuaciones else 0,
+        'distribucion_puntuacion': {str(puntos): cantidad for puntos, cantidad in sorted(puntuaciones.items())},
+    }
+
+
+def simular(minimo, maximo, intentos_maximos, estrategia='binaria', partidas=1_000_000,
+            sesgo=0.25, semilla=None):
+    """Juega ``partidas`` partidas con una estrategia y devuelve el informe (ver resumir)."""
+    if estrategia not in ESTRATEGIAS:
+        raise ValueError(f"Estrategia desconocida: {estrategia}")
+    # Las mismas validaciones que el juego
+    if minimo >= maximo:
+        raise ValueError("El límite inferior debe ser menor que el límite superior.")
+    if intentos_maximos <= 0:
+        raise ValueError("El número de intentos debe ser mayor que cero.")
+    
+    pasos_por_cantidad = [0] * (intentos_maximos + 1)
+    if np is None:
+        for usados in _simular_python(minimo, maximo, intentos_maximos, estrategia, partidas, sesgo, semilla):
+            pasos_por_cantidad[usados] += 1
+    else:
+        if minimo < -2 ** 62 or maximo > 2 ** 62:
+            raise ValueError("Con NumPy el rango debe caber en enteros de 64 bits")
+        azar = np.random.default_rng(semilla)
+        restantes = partidas
+        while restantes:
+            bloque = min(restantes, PARTIDAS_POR_BLOQUE)
+            pasos = _simular_bloque(minimo, maximo, intentos_maximos, estrategia, bloque, sesgo, azar)
+            cuentas = np.bincount(pasos, minlength=intentos_maximos + 1)
+            for usados, cantidad in enumerate(cuentas.tolist()):
+                pasos_por_cantidad[usados] += cantidad
+            restantes -= bloque
+    
+    informe = resumir(pasos_por_cantidad, minimo, maximo, intentos_maximos, partidas)
+    informe.update(estrategia=estrategia, minimo=minimo, maximo=maximo, intentos_maximos=intentos_maximos)
+    if estrategia == 'sesgada':
+        informe['sesgo'] = sesgo
+    return informe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulador Monte Carlo del juego de adivinanza")
+    parser.add_argument('--minimo', type=int, default=1)
+    parser.add_argument('--maximo', type=int, default=100)
+    parser.add_argument('--intentos', type=int, nargs='+', default=[10], help="Uno o más presupuestos de intentos")
+    parser.add_argument('--partidas', type=int, default=1_000_000)
+    parser.add_argument('--estrategia', choices=ESTRATEGIAS, nargs='+', default=['binaria'])
+    parser.add_argument('--sesgo', type=float, default=0.25, help="Punto del rango que elige la estrategia sesgada")
+    parser.add_argument('--semilla', type=int)
+    parser.add_argument('--salida', help="Guardar los informes en JSON")
+    args = parser.parse_args()
+    
+    if np is None:
+        print("NumPy no está instalado: se simula partida por partida (lento)", file=sys.stderr)
+    
+    informes = []
+    for intentos in args.intentos:
+        for estrategia in args.estrategia:
+            inicio = time.perf_counter()
+            informe = simular(args.minimo, args.maximo, intentos, estrategia, args.partidas, args.sesgo,
+                              args.semilla)
+            informe['segundos'] = time.perf_counter() - inicio
+            informes.append(informe)
+            print(f"{estrategia:>9} intentos={intentos:<3} victorias {informe['tasa_victoria']:7.2%}  "
+                  f"intentos medios {informe['intentos_medios_al_ganar']:5.2f}  "
+                  f"puntuación media {informe['puntuacion_media']:8.1f} (p50 {informe['puntuacion_p50']}, "
+                  f"p90 {informe['puntuacion_p90']})  {informe['segundos']:.2f} s")
+    
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as archivo:
+            json.dump(informes, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()